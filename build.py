@@ -9,15 +9,26 @@ import subprocess
 import sys
 import os
 import shutil
+import hashlib
+import json
+import mmap
+import re
 import argparse
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT / "tools"))
+from fastcopy import clone_tree, fast_copy2, link_or_copy
+
 RUST_FFI_DIR = ROOT / "rust_ffi"
 APP_NAME = "Keystone"
 
 DYLIB_DIR = ROOT / "dylib"
 NATIVE_DIR = DYLIB_DIR / "native"
+BUILD_CACHE_DIR = ROOT / ".keystone-build-cache"
 
 # Platform detection
 if sys.platform == "darwin":
@@ -38,25 +49,121 @@ APP_OUT = app_out_path()
 APP_BUNDLE = APP_OUT / f"{APP_NAME}.app"
 
 def run(cmd, cwd=None, check=True):
-    print(f"  $ {' '.join(cmd) if isinstance(cmd, list) else cmd}")
-    return subprocess.run(cmd, cwd=cwd, check=check, shell=isinstance(cmd, str))
+    """Run an argv list directly (never through /bin/sh)."""
+    print(f"  $ {' '.join(map(str, cmd))}")
+    return subprocess.run(cmd, cwd=cwd, check=check)
+
+
+_trash_threads = []
+
+def discard_tree(path, trash_dir=None):
+    """Move a directory out of the way and delete it on a background thread, so the
+    caller can immediately write a fresh tree at path. Deletions are joined at exit.
+    trash_dir (default: path's parent) must be on the same volume, and outside any tree
+    that is walked or signed while the delete runs."""
+    trash_dir = Path(trash_dir) if trash_dir else Path(path).parent
+    trash = trash_dir / f".{Path(path).name}.trash-{os.getpid()}"
+    if trash.exists():
+        shutil.rmtree(trash)
+    os.rename(path, trash)
+    t = threading.Thread(target=shutil.rmtree, args=(trash,), kwargs={"ignore_errors": True})
+    t.start()
+    if not _trash_threads:
+        atexit.register(lambda: [t.join() for t in _trash_threads])
+    _trash_threads.append(t)
+
+def walk(root, skip_dirs):
+    """Yield a DirEntry for every file under root. Directories named in skip_dirs are
+    pruned before descent; DirEntry.is_dir() reuses the d_type from readdir, so no extra stat."""
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in skip_dirs:
+                        stack.append(entry.path)
+                else:
+                    yield entry
+
+
+# ─── Incremental build cache ─────────────────────────────────────────────────
+# Each step records a BLAKE2b hash of its inputs in .keystone-build-cache/<step>.json.
+# A step is skipped when the hash matches and its outputs are still on disk.
+
+USE_BUILD_CACHE = True
+CACHE_SKIP_DIRS = {"target", "bin", "obj", "node_modules", ".git"}
+
+def collect_files(root, suffixes=None, names=()):
+    """Files under root whose suffix is in suffixes (None = all) or whose name is in names."""
+    return [Path(e.path) for e in walk(root, CACHE_SKIP_DIRS)
+            if e.name in names or suffixes is None or os.path.splitext(e.name)[1] in suffixes]
+
+def hash_files(paths):
+    """BLAKE2b over (relative path, contents) of each file. Missing files hash as absent."""
+    h = hashlib.blake2b(digest_size=16)
+    for p in sorted(set(paths)):
+        h.update(os.fsencode(os.path.relpath(p, ROOT)) + b"\0")
+        try:
+            with open(p, "rb") as f:
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                        h.update(m)
+        except FileNotFoundError:
+            h.update(b"\0missing")
+    return h.hexdigest()
+
+def cache_hit(step, debug, digest, outputs):
+    """True when the stamp for step matches digest and every output path exists."""
+    if not USE_BUILD_CACHE:
+        return False
+    try:
+        stamp = json.loads((BUILD_CACHE_DIR / f"{step}.json").read_text())
+    except (OSError, ValueError):
+        return False
+    if stamp != {"step": step, "debug": debug, "hash": digest}:
+        return False
+    return all(Path(o).exists() for o in outputs)
+
+def cache_store(step, debug, digest):
+    BUILD_CACHE_DIR.mkdir(exist_ok=True)
+    (BUILD_CACHE_DIR / f"{step}.json").write_text(
+        json.dumps({"step": step, "debug": debug, "hash": digest}))
 
 
 def clean():
     print("\n=== Cleaning ===")
-    for csproj in ROOT.rglob("*.csproj"):
-        proj_dir = csproj.parent
+    # Collect first, then remove in parallel — each tree is independent and rmtree is
+    # bound on per-entry unlink syscalls
+    targets = []
+    for entry in walk(ROOT, {"bin", "obj", "node_modules", ".git", "target", "dylib"}):
+        if not entry.name.endswith(".csproj"):
+            continue
+        proj_dir = Path(entry.path).parent
         for name in ["bin", "obj"]:
             d = proj_dir / name
-            if d.exists() and d.is_dir():
-                shutil.rmtree(d)
-                print(f"  Removed {proj_dir.name}/{name}/")
-    if DYLIB_DIR.exists():
-        shutil.rmtree(DYLIB_DIR)
-        print(f"  Removed {DYLIB_DIR.name}/")
+            if d.is_dir():
+                targets.append((d, f"{proj_dir.name}/{name}/"))
+    for d in (DYLIB_DIR, BUILD_CACHE_DIR):
+        if d.exists():
+            targets.append((d, f"{d.name}/"))
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for (_, label), _ in zip(targets, pool.map(lambda t: shutil.rmtree(t[0]), targets)):
+            print(f"  Removed {label}")
 
 def build_rust(debug=False):
     print("\n=== Building Rust Native Libraries ===")
+    dylibs = [
+        "libkeystone_layout.dylib",
+    ]
+    digest = hash_files(collect_files(RUST_FFI_DIR, {".rs"}, names=("Cargo.toml", "Cargo.lock")))
+    if cache_hit("rust", debug, digest, [NATIVE_DIR / name for name in dylibs]):
+        print("  keystone-layout skipped (cached)")
+        return
+
     os.chdir(RUST_FFI_DIR)
 
     print("\nBuilding keystone-layout...")
@@ -70,23 +177,18 @@ def build_rust(debug=False):
     NATIVE_DIR.mkdir(parents=True, exist_ok=True)
     rust_target = RUST_FFI_DIR / "target" / ("debug" if debug else "release")
 
-    dylibs = [
-        "libkeystone_layout.dylib",
-    ]
-
     print("\nCopying native dylibs to dylib/native/...")
     for name in dylibs:
         src = rust_target / name
         dst = NATIVE_DIR / name
         if src.exists():
-            shutil.copy2(src, dst)
+            link_or_copy(src, dst)
             print(f"  {name}")
         else:
             print(f"  {name} (not found)")
+    cache_store("rust", debug, digest)
 
-def build_core(debug=False):
-    config = "Debug" if debug else "Release"
-    print(f"\n=== Building Keystone Desktop ({config}) ===")
+def core_projects():
     projects = [
         ("Keystone.Core", "Keystone.Core/Keystone.Core.csproj"),
         ("Keystone.Core.Platform", "Keystone.Core.Platform/Keystone.Core.Platform.csproj"),
@@ -100,16 +202,145 @@ def build_core(debug=False):
         projects.append(("Keystone.Core.Graphics.Skia.D3D", "Keystone.Core.Graphics.Skia.D3D/Keystone.Core.Graphics.Skia.D3D.csproj"))
     elif sys.platform == "linux":
         projects.append(("Keystone.Core.Graphics.Skia.Vulkan", "Keystone.Core.Graphics.Skia.Vulkan/Keystone.Core.Graphics.Skia.Vulkan.csproj"))
+    return projects
+
+_PROJECT_REF_RE = re.compile(r'<ProjectReference\s+Include="([^"]+)"')
+
+def project_inputs(csproj, seen=None):
+    """Source files of a C# project and, transitively, of every project it references."""
+    seen = set() if seen is None else seen
+    csproj = csproj.resolve()
+    if csproj in seen or not csproj.exists():
+        return []
+    seen.add(csproj)
+    files = collect_files(csproj.parent, {".cs", ".csproj", ".json"})
+    for ref in _PROJECT_REF_RE.findall(csproj.read_text()):
+        files += project_inputs(csproj.parent / ref.replace("\\", "/"), seen)
+    return files
+
+def project_levels(projects):
+    """Group (name, proj) pairs into dependency levels; each level only references earlier ones."""
+    paths = {(ROOT / proj).resolve(): (name, proj) for name, proj in projects}
+    deps = {}
+    for path in paths:
+        refs = _PROJECT_REF_RE.findall(path.read_text())
+        deps[path] = {(path.parent / r.replace("\\", "/")).resolve() for r in refs} & paths.keys()
+    levels, done = [], set()
+    while len(done) < len(paths):
+        level = [p for p in paths if p not in done and deps[p] <= done]
+        if not level:
+            raise SystemExit("  ERROR: cyclic ProjectReference graph")
+        levels.append([paths[p] for p in level])
+        done.update(level)
+    return levels
+
+def _dotnet_build(proj_path, config):
+    # Dependencies were built by an earlier level; one MSBuild node per process since we fan out here
+    cmd = ["dotnet", "build", str(proj_path), "-c", config, "-f", FRAMEWORK,
+           "--no-dependencies", "-maxcpucount:1", "--nologo"]
+    return cmd, subprocess.run(cmd, capture_output=True, text=True)
+
+def _solution_projects(solution):
+    """Resolved project paths listed in a .slnx solution."""
+    return {(solution.parent / p.replace("\\", "/")).resolve()
+            for p in re.findall(r'<Project\s+Path="([^"]+)"', solution.read_text())}
 
-    for name, proj in projects:
-        print(f"\nBuilding {name}...")
-        run(["dotnet", "build", str(ROOT / proj), "-c", config, "-f", FRAMEWORK])
+def build_core(debug=False):
+    config = "Debug" if debug else "Release"
+    print(f"\n=== Building Keystone Desktop ({config}) ===")
+
+    levels = project_levels(core_projects())
+    stale = set()
+    digests = {}
+    for level in levels:
+        for name, proj in level:
+            proj_path = ROOT / proj
+            digests[name] = hash_files(project_inputs(proj_path) + [ROOT / "global.json"])
+            out_dll = proj_path.parent / "bin" / config / FRAMEWORK / f"{name}.dll"
+            if cache_hit(name, debug, digests[name], [out_dll]):
+                print(f"\n{name} skipped (cached)")
+            else:
+                stale.add(name)
+    if not stale:
+        return
+
+    # Preferred: one MSBuild invocation over a solution filter of the stale projects.
+    # -graph schedules independent projects in parallel inside a single warmed-up
+    # MSBuild process instead of paying SDK startup once per project.
+    solution = ROOT / "Keystone.slnx"
+    stale_paths = {name: (ROOT / proj).resolve() for level in levels for name, proj in level if name in stale}
+    if solution.exists() and set(stale_paths.values()) <= _solution_projects(solution):
+        BUILD_CACHE_DIR.mkdir(exist_ok=True)
+        slnf = BUILD_CACHE_DIR / "core.slnf"
+        slnf.write_text(json.dumps({"solution": {
+            "path": os.path.relpath(solution, BUILD_CACHE_DIR),
+            "projects": sorted(os.path.relpath(p, ROOT) for p in stale_paths.values()),
+        }}, indent=2))
+        print(f"\nBuilding {', '.join(sorted(stale))}...")
+        run(["dotnet", "build", str(slnf), "-c", config, "-f", FRAMEWORK,
+             "-graph", "-maxcpucount", "--nologo"])
+        for name in stale:
+            cache_store(name, debug, digests[name])
+        return
+
+    # Fallback (projects outside the solution, e.g. platform graphics backends):
+    # fan out per dependency level
+    for level in levels:
+        pending = [(name, ROOT / proj) for name, proj in level if name in stale]
+        if not pending:
+            continue
+
+        print(f"\nBuilding {', '.join(name for name, _ in pending)}...")
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            futures = {pool.submit(_dotnet_build, proj_path, config): name
+                       for name, proj_path in pending}
+            failed = None
+            # Output is buffered per project and printed as each finishes so logs don't interleave
+            for future in as_completed(futures):
+                name = futures[future]
+                cmd, result = future.result()
+                print(f"\n[{name}]\n  $ {' '.join(cmd)}")
+                print(result.stdout, end="")
+                print(result.stderr, end="", file=sys.stderr)
+                if result.returncode == 0:
+                    cache_store(name, debug, digests[name])
+                elif failed is None:
+                    failed = subprocess.CalledProcessError(result.returncode, cmd)
+            if failed:
+                raise failed
+
+# 32/64-bit thin Mach-O in either byte order, plus universal (fat) binaries
+_MACHO_MAGICS = {bytes.fromhex(m) for m in (
+    "feedface", "cefaedfe", "feedfacf", "cffaedfe", "cafebabe", "bebafeca")}
+
+def _is_macho(path):
+    """True for regular files starting with a Mach-O magic number."""
+    if path.is_symlink() or not path.is_file():
+        return False
+    with open(path, "rb") as f:
+        return f.read(4) in _MACHO_MAGICS
+
+def _codesign(path):
+    """Ad-hoc sign a single mach-o. Returns the CompletedProcess."""
+    return subprocess.run(["codesign", "--force", "--sign", "-", str(path)],
+                          capture_output=True, text=True)
 
 def build_app(debug=False):
     config = "Debug" if debug else "Release"
     print(f"\n=== Building Keystone.App ({config}) ===")
     app_proj = ROOT / "Keystone.App" / "Keystone.App.csproj"
 
+    # Keyed on the app project + every referenced core project, the bundle resources,
+    # the native dylibs and the engine bun tree
+    app_inputs = project_inputs(app_proj) + [ROOT / "global.json"]
+    app_inputs += [p for p in collect_files(ROOT / "Keystone.App") if p.suffix in (".plist", ".icns")]
+    app_inputs += collect_files(NATIVE_DIR, {".dylib"})
+    app_inputs += [p for p in collect_files(ROOT / "bun") if p.name != ".DS_Store"]
+    digest = hash_files(app_inputs)
+    if cache_hit("app", debug, digest, [APP_BUNDLE / "Contents" / "MacOS"]):
+        print("  Keystone.App skipped (cached)")
+        return
+
     print("\nPublishing app...")
     run([
         "dotnet", "publish", str(app_proj),
@@ -129,17 +360,17 @@ def build_app(debug=False):
 
     info_plist = ROOT / "Keystone.App" / "Info.plist"
     if info_plist.exists():
-        shutil.copy2(info_plist, bundle_contents / "Info.plist")
+        fast_copy2(info_plist, bundle_contents / "Info.plist")
 
     icon = ROOT / "Keystone.App" / "Resources" / "AppIcon.icns"
     if icon.exists():
-        shutil.copy2(icon, bundle_resources / "AppIcon.icns")
+        fast_copy2(icon, bundle_resources / "AppIcon.icns")
 
     print("\nCopying native dylibs to bundle...")
     if NATIVE_DIR.exists():
         for dylib in NATIVE_DIR.glob("*.dylib"):
             dst = bundle_macos / dylib.name
-            shutil.copy2(dylib, dst)
+            fast_copy2(dylib, dst)
             print(f"  {dylib.name}")
 
     print("\nCopying engine bun runtime to bundle...")
@@ -147,15 +378,27 @@ def build_app(debug=False):
     bundle_bun = bundle_resources / "bun"
     if engine_bun.exists():
         if bundle_bun.exists():
-            shutil.rmtree(bundle_bun)
-        shutil.copytree(engine_bun, bundle_bun,
-                        ignore=shutil.ignore_patterns("node_modules", ".DS_Store"))
+            # Trash goes next to the .app, not inside it: the leaf scan and codesign
+            # below walk the bundle while the delete is still running
+            discard_tree(bundle_bun, APP_OUT)
+        clone_tree(engine_bun, bundle_bun, ignore=("node_modules", ".DS_Store"))
         print(f"  bun/ → Resources/bun/")
 
     print("\nSigning app bundle...")
-    run(["codesign", "--force", "--deep", "--sign", "-", str(APP_BUNDLE)])
+    # Leaves first, in parallel, then the outer bundle once — --deep would re-hash every
+    # nested mach-o (dotnet runtime dylibs, createdump, bun) on each pass. Leaves are found
+    # by magic number so extensionless executables aren't left unsigned
+    leaves = [p for p in bundle_contents.rglob("*") if _is_macho(p)]
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        for leaf, result in zip(leaves, pool.map(_codesign, leaves)):
+            if result.returncode != 0:
+                print(result.stderr, end="", file=sys.stderr)
+                raise subprocess.CalledProcessError(result.returncode, ["codesign", str(leaf)])
+    print(f"  {len(leaves)} nested binaries signed")
+    run(["codesign", "--force", "--sign", "-", str(APP_BUNDLE)])
     run(["xattr", "-dr", "com.apple.quarantine", str(APP_BUNDLE)])
     print("  App signed with ad-hoc signature")
+    cache_store("app", debug, digest)
 
 def print_summary():
     print("\n" + "=" * 50)
@@ -180,10 +423,14 @@ def main():
     parser.add_argument("--app-only", action="store_true", help="Only build app bundle")
     parser.add_argument("--no-rust", action="store_true", help="Skip Rust build")
     parser.add_argument("--debug", action="store_true", help="Build in Debug mode")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore the build cache and rebuild every step")
     args = parser.parse_args()
 
     os.chdir(ROOT)
 
+    global USE_BUILD_CACHE
+    USE_BUILD_CACHE = not args.no_cache
+
     if args.clean:
         clean()
 
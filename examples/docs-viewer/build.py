@@ -12,7 +12,7 @@ Usage:
 
 import subprocess
 import os
-import shutil
+import sys
 import argparse
 from pathlib import Path
 
@@ -20,9 +20,12 @@ APP_ROOT = Path(__file__).parent
 ENGINE_ROOT = (APP_ROOT / ".." / "..").resolve()
 DYLIB_DIR = APP_ROOT / "dylib"
 
+sys.path.insert(0, str(ENGINE_ROOT / "tools"))
+from fastcopy import fast_copy2
+
 def run(cmd, cwd=None, check=True):
-    print(f"  $ {' '.join(cmd) if isinstance(cmd, list) else cmd}")
-    return subprocess.run(cmd, cwd=cwd, check=check, shell=isinstance(cmd, str))
+    print(f"  $ {' '.join(map(str, cmd))}")
+    return subprocess.run(cmd, cwd=cwd, check=check)
 
 
 def copy_native_libs():
@@ -37,7 +40,7 @@ def copy_native_libs():
     native_dst.mkdir(parents=True, exist_ok=True)
     copied = 0
     for dylib in native_src.glob("*.dylib"):
-        shutil.copy2(dylib, native_dst / dylib.name)
+        fast_copy2(dylib, native_dst / dylib.name)
         print(f"  Copied {dylib.name} → dylib/native/")
         copied += 1
 
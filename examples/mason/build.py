@@ -10,52 +10,156 @@ Usage:
   python3 build.py --debug  # Debug mode (combine with --run or --package)
 """
 
+import functools
+import hashlib
+import io
+import os
+import runpy
 import subprocess
 import sys
+import shutil
 import tarfile
 import urllib.request
 from pathlib import Path
 
 APP_ROOT = Path(__file__).parent
 KEYSTONE_VERSION = "0.1.0"
+# sha256 of the release tarball, filled in at release time; empty skips verification
+KEYSTONE_SHA256 = ""
 ENGINE_CACHE = Path.home() / ".keystone" / "engines" / KEYSTONE_VERSION
+DOWNLOAD_CHUNK = 1024 * 1024
+# Resolved engine path from the last run ("<version>\n<path>\n"); removed by --clean
+ENGINE_PATH_CACHE = APP_ROOT / ".keystone" / "engine_path"
+
+
+class _HashingReader:
+    """Read-only wrapper that feeds every chunk read from src into a hash."""
+
+    def __init__(self, src, h):
+        self.src = src
+        self.h = h
+
+    def read(self, n=-1):
+        data = self.src.read(n)
+        self.h.update(data)
+        return data
+
+    def readinto(self, b):
+        n = self.src.readinto(b)
+        self.h.update(memoryview(b)[:n])
+        return n
+
+    def readable(self):
+        return True
+
+    @property
+    def closed(self):
+        return self.src.closed
+
+
+def _extract_members(t, dest_dir: Path):
+    """Extract a streaming tarfile, skipping regular files already on disk with the
+    archive's size and mtime (left by an earlier, interrupted extract of the same
+    version). Only used where tar isn't on PATH, so macOS never takes this path."""
+    for member in t:
+        if member.isfile():
+            try:
+                st = os.stat(os.path.join(dest_dir, member.name))
+                if st.st_size == member.size and int(st.st_mtime) == int(member.mtime):
+                    continue
+            except OSError:
+                pass
+        t.extract(member, dest_dir)
+
+
+def _extract_stream(src, dest_dir: Path):
+    """Extract a .tar.gz stream into dest_dir — native tar reading stdin when available,
+    the tarfile module otherwise (e.g. Windows without tar on PATH)."""
+    tar = shutil.which("tar")
+    if tar is None:
+        with tarfile.open(fileobj=io.BufferedReader(src, buffer_size=DOWNLOAD_CHUNK),
+                          mode="r|gz", bufsize=DOWNLOAD_CHUNK) as t:
+            _extract_members(t, dest_dir)
+        # tarfile stops at the end-of-archive marker; drain the rest so callers see every byte
+        while src.read(DOWNLOAD_CHUNK):
+            pass
+        return
+    proc = subprocess.Popen([tar, "-xzf", "-", "-C", str(dest_dir)], stdin=subprocess.PIPE)
+    try:
+        shutil.copyfileobj(src, proc.stdin, DOWNLOAD_CHUNK)
+    finally:
+        proc.stdin.close()
+    if proc.wait() != 0:
+        raise subprocess.CalledProcessError(proc.returncode, proc.args)
+
+
+@functools.lru_cache(maxsize=256)
+def _exists(path: str) -> bool:
+    """os.path.exists, memoized so the cache check and probe chain stat each path once."""
+    return os.path.exists(path)
+
+
+def _is_engine(path: Path) -> bool:
+    return (_exists(os.path.join(path, "version.txt")) or _exists(os.path.join(path, "Keystone.App"))
+            or _exists(os.path.join(path, "Keystone.Core")))
 
 
 def find_engine() -> Path:
-    """Locate the Keystone Desktop engine."""
+    """Locate the Keystone Desktop engine, reusing the last resolved path while it is
+    still valid for KEYSTONE_VERSION."""
+    try:
+        version, cached = ENGINE_PATH_CACHE.read_text().splitlines()[:2]
+        if version == KEYSTONE_VERSION and _is_engine(Path(cached)):
+            return Path(cached)
+    except (OSError, ValueError):
+        pass
+    engine = _probe_engine()
+    try:
+        ENGINE_PATH_CACHE.parent.mkdir(exist_ok=True)
+        ENGINE_PATH_CACHE.write_text(f"{KEYSTONE_VERSION}\n{engine}\n")
+    except OSError:
+        pass
+    return engine
+
+
+def _probe_engine() -> Path:
     # 1. In-repo (examples/mason/ inside the engine tree)
     inrepo = APP_ROOT.parent.parent
-    if (inrepo / "Keystone.App").exists() or (inrepo / "Keystone.Core").exists():
+    if _exists(os.path.join(inrepo, "Keystone.App")) or _exists(os.path.join(inrepo, "Keystone.Core")):
         return inrepo
     # 2. Adjacent source checkout (standalone development)
     local = APP_ROOT.parent / "keystone_desktop"
-    if (local / "Keystone.App").exists() or (local / "Keystone.Core").exists():
+    if _exists(os.path.join(local, "Keystone.App")) or _exists(os.path.join(local, "Keystone.Core")):
         return local
     # 3. Vendored in project
     vendored = APP_ROOT / "keystone-desktop"
-    if (vendored / "version.txt").exists():
+    if _exists(os.path.join(vendored, "version.txt")):
         return vendored
     # 4. Global cache
-    if (ENGINE_CACHE / "version.txt").exists():
+    if _exists(os.path.join(ENGINE_CACHE, "version.txt")):
         return ENGINE_CACHE
     # 5. Auto-download
     print(f"\nKeystone Desktop {KEYSTONE_VERSION} not found — downloading...")
     tarball_name = f"Keystone-{KEYSTONE_VERSION}-arm64.tar.gz"
     url = f"https://github.com/khayzz13/keystone_desktop/releases/download/{KEYSTONE_VERSION}/{tarball_name}"
     ENGINE_CACHE.mkdir(parents=True, exist_ok=True)
-    tmp = ENGINE_CACHE.parent / tarball_name
-    print(f"  Downloading {url}")
+    print(f"  Downloading and extracting {url}")
+    # Stream network -> gunzip -> untar; the tarball never lands on disk. The bytes are
+    # hashed as they pass through, so verification needs no second read.
+    digest = hashlib.sha256()
     try:
-        urllib.request.urlretrieve(url, tmp)
+        with urllib.request.urlopen(url) as resp:
+            _extract_stream(_HashingReader(resp, digest), ENGINE_CACHE.parent)
     except Exception as e:
         print(f"  ERROR: Download failed: {e}")
         print(f"  Download manually and extract to {ENGINE_CACHE}")
         sys.exit(1)
-    print(f"  Extracting...")
-    with tarfile.open(tmp) as t:
-        t.extractall(ENGINE_CACHE.parent)
-    tmp.unlink(missing_ok=True)
     extracted = ENGINE_CACHE.parent / "keystone-desktop"
+    if KEYSTONE_SHA256 and digest.hexdigest() != KEYSTONE_SHA256:
+        shutil.rmtree(extracted, ignore_errors=True)
+        print(f"  ERROR: Checksum mismatch for {tarball_name} (got {digest.hexdigest()})")
+        print(f"  Download manually and extract to {ENGINE_CACHE}")
+        sys.exit(1)
     if extracted.exists() and extracted != ENGINE_CACHE:
         extracted.rename(ENGINE_CACHE)
     print(f"  Engine ready at {ENGINE_CACHE}")
@@ -63,6 +167,7 @@ def find_engine() -> Path:
 
 
 def main():
+    _exists.cache_clear()
     engine = find_engine()
     cli = engine / "tools" / "cli.py"
     if not cli.exists():
@@ -75,6 +180,7 @@ def main():
     if "--clean" in args:
         command = "clean"
         flags = [a for a in args if a != "--clean"]
+        shutil.rmtree(APP_ROOT / ".keystone", ignore_errors=True)
     elif "--package" in args:
         command = "package"
         flags = [a for a in args if a != "--package"]
@@ -85,8 +191,10 @@ def main():
         command = "build"
         flags = args
 
-    cmd = [sys.executable, str(cli), str(APP_ROOT), command] + flags
-    sys.exit(subprocess.run(cmd).returncode)
+    # Run the engine CLI in this interpreter rather than a second Python process; its
+    # sys.exit() codes propagate unchanged
+    sys.argv = [str(cli), str(APP_ROOT), command] + flags
+    runpy.run_path(str(cli), run_name="__main__")
 
 
 if __name__ == "__main__":
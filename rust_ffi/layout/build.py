@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 import subprocess
 import sys
-import shutil
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "tools"))
+from fastcopy import link_or_copy
+
 def build():
     print("Building libkeystone_layout.dylib...")
 
@@ -20,7 +22,7 @@ def build():
     src = Path(__file__).parent / "../target/release/libkeystone_layout.dylib"
     dst = Path(__file__).parent / "../../dylib/native/libkeystone_layout.dylib"
     dst.parent.mkdir(exist_ok=True)
-    shutil.copy2(src, dst)
+    link_or_copy(src, dst)
 
     print(f"✓ Built: {dst}")
     print(f"✓ Size: {dst.stat().st_size / 1024:.1f} KB")
@@ -18,113 +18,280 @@ import sys
 import json
 import re
 import shutil
+import stat
+import filecmp
+import fnmatch
+import functools
+import hashlib
 import argparse
-import tarfile
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 SCRIPT_DIR = Path(__file__).parent
 ENGINE_ROOT = SCRIPT_DIR.parent
 
+# Shared copy helpers live next to this script; also needed when it runs via runpy
+sys.path.insert(0, str(SCRIPT_DIR))
+from fastcopy import clone_tree, fast_copy2
+from jsonc import strip_comments
+
 _version_file = ENGINE_ROOT / "version.txt"
 ENGINE_VERSION = _version_file.read_text().strip() if _version_file.exists() else "0.1.0"
 
 
-def run(cmd, cwd=None, check=True):
-    print(f"  $ {' '.join(str(c) for c in cmd) if isinstance(cmd, list) else cmd}")
-    return subprocess.run(cmd, cwd=cwd, check=check, shell=isinstance(cmd, str))
+def run(cmd, cwd=None, check=True, prefix=None):
+    """Run an argv list directly (never through /bin/sh). With prefix, output is relayed
+    line by line behind that tag so it stays readable next to a concurrent step."""
+    print(f"  {prefix or ''}$ {' '.join(map(str, cmd))}")
+    if prefix is None:
+        return subprocess.run(cmd, cwd=cwd, check=check)
+    proc = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            text=True, errors="replace")
+    for line in proc.stdout:
+        print(f"  {prefix}{line}", end="")
+    proc.wait()
+    if check and proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+    return subprocess.CompletedProcess(cmd, proc.returncode)
+
+
+@functools.lru_cache(maxsize=None)
+def _tool(name: str) -> str:
+    """Absolute path of a build tool, looked up on PATH once per run so each spawn
+    skips the execvp PATH search. Falls back to the bare name."""
+    return shutil.which(name) or name
+
+
+# ─── Filesystem helpers ──────────────────────────────────────────────────────
+
+def sync_tree(src: Path, dst: Path, ignore=(), paranoid=False):
+    """Mirror src into dst rsync-style: copy only files whose (size, mtime_ns) differ and
+    delete anything dst has that src doesn't. A missing dst is cloned whole.
+    Same-size files whose mtime alone moved are byte-compared and, if identical, only
+    have their mtime updated. paranoid byte-compares every file, ignoring the stat match."""
+    if not dst.exists():
+        clone_tree(src, dst, ignore)
+        return
+    stack = [""]
+    while stack:
+        rel = stack.pop()
+        src_dir, dst_dir = os.path.join(src, rel), os.path.join(dst, rel)
+        os.makedirs(dst_dir, exist_ok=True)
+        keep = set()
+        with os.scandir(src_dir) as it:
+            for entry in it:
+                if any(fnmatch.fnmatch(entry.name, p) for p in ignore):
+                    continue
+                keep.add(entry.name)
+                dst_path = os.path.join(dst_dir, entry.name)
+                if entry.is_dir():
+                    stack.append(os.path.join(rel, entry.name))
+                    continue
+                st = entry.stat()
+                try:
+                    dst_st = os.lstat(dst_path)
+                except FileNotFoundError:
+                    dst_st = None
+                if dst_st is not None:
+                    if stat.S_ISDIR(dst_st.st_mode):
+                        shutil.rmtree(dst_path)
+                    elif dst_st.st_size == st.st_size:
+                        if dst_st.st_mtime_ns == st.st_mtime_ns and not paranoid:
+                            continue
+                        if filecmp.cmp(entry.path, dst_path, shallow=False):
+                            os.utime(dst_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+                            continue
+                fast_copy2(entry.path, dst_path)
+        with os.scandir(dst_dir) as it:
+            for entry in it:
+                if entry.name not in keep:
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path)
+                    else:
+                        os.unlink(entry.path)
+
+
+def _copy_if_changed(src: Path, dst: Path):
+    """fast_copy2 unless dst already has src's (size, mtime_ns) — leaves dst's mtime
+    untouched so downstream watchers and bundlers don't see a spurious change."""
+    st = src.stat()
+    try:
+        dst_st = dst.stat()
+        if (dst_st.st_size, dst_st.st_mtime_ns) == (st.st_size, st.st_mtime_ns):
+            return
+    except FileNotFoundError:
+        pass
+    fast_copy2(src, dst)
+
+
+def _walk(root: Path, skip_dirs):
+    """Yield a DirEntry for every file under root. Directories named in skip_dirs are
+    pruned before descent; DirEntry.is_dir() reuses the d_type from readdir, so no extra stat."""
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in skip_dirs:
+                        stack.append(entry.path)
+                else:
+                    yield entry
+
+
+# ─── Parsed config cache ─────────────────────────────────────────────────────
+
+CONFIG_CACHE_DIR = Path.home() / ".keystone" / "cache"
+
+
+def _cached_parse(path: Path, parser) -> dict:
+    """Return parser(text) for path, reusing the JSON dump from a previous CLI invocation
+    while the file's (mtime_ns, size) is unchanged."""
+    st = path.stat()
+    key = f"{st.st_mtime_ns}:{st.st_size}"
+    entry = CONFIG_CACHE_DIR / (hashlib.blake2b(os.fsencode(path), digest_size=16).hexdigest() + ".json")
+    try:
+        cached = json.loads(entry.read_text())
+        if cached.get("key") == key:
+            return cached["data"]
+    except (OSError, ValueError, AttributeError, KeyError):
+        pass
+
+    data = parser(path.read_text())
+    try:
+        payload = json.dumps({"path": str(path), "key": key, "data": data})
+        # Only cache what JSON gives back unchanged — e.g. integer keys would come back as
+        # strings, and a cache hit must return exactly what the parser did
+        if json.loads(payload)["data"] != data:
+            return data
+        CONFIG_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = entry.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(payload)
+        os.replace(tmp, entry)
+    except (OSError, TypeError, ValueError):
+        pass  # unwritable cache or a value JSON can't hold (e.g. a YAML date) — just don't cache
+    return data
 
 
 # ─── YAML loading (minimal, no external deps) ────────────────────────────────
 
 def load_build_yaml(app_root: Path) -> dict:
-    """Load keystone.build.yaml. Returns empty dict if absent."""
-    path = app_root / "keystone.build.yaml"
+    """Load keystone.build.yaml. Returns empty dict if absent. Parsed once per app root."""
+    return _load_build_yaml(str(app_root.resolve()))
+
+
+@functools.lru_cache(maxsize=None)
+def _load_build_yaml(app_root: str) -> dict:
+    path = Path(app_root) / "keystone.build.yaml"
     if not path.exists():
         return {}
+    return _cached_parse(path, _parse_build_yaml)
 
+
+def _parse_build_yaml(text: str) -> dict:
     try:
         import yaml
-        return yaml.safe_load(path.read_text()) or {}
+        return yaml.safe_load(text) or {}
     except ImportError:
         pass
 
     # Fallback: minimal YAML parser for flat/simple configs
-    return _parse_simple_yaml(path.read_text())
+    return _parse_simple_yaml(text)
+
+
+# indent, key, then a quoted or bare value; a " #" comment and trailing blanks are dropped
+# (a bare value can't start with "#", so `key: # note` leaves val empty with a comment)
+_YAML_LINE_RE = re.compile(
+    r'^(?P<indent>[ \t]*)(?P<key>[^:#\s][^:\n]*?)[ \t]*:[ \t]*'
+    r'(?P<val>"[^"\n]*"|\'[^\'\n]*\'|(?:[^#\n][^\n]*?)?)[ \t]*(?P<comment>(?<=[ \t])#[^\n]*)?\r?$',
+    re.MULTILINE)
+
+_YAML_CONSTANTS = {"true": True, "false": False, "null": None, "~": None}
 
 
 def _parse_simple_yaml(text: str) -> dict:
     """Parse simple YAML (flat keys, no nesting beyond one level). Good enough for build config."""
     result = {}
     current_section = None
-    for line in text.splitlines():
-        stripped = line.strip()
-        if not stripped or stripped.startswith("#"):
-            continue
-        # Top-level key with value
-        if not line[0].isspace() and ":" in stripped:
-            key, _, val = stripped.partition(":")
-            key = key.strip()
-            val = val.strip()
-            if val:
+    for m in _YAML_LINE_RE.finditer(text):
+        key, val = m["key"], m["val"]
+        if not m["indent"]:
+            # Only a bare `key:` opens a section; `key: # note` is an empty scalar
+            if val or m["comment"]:
                 result[key] = _yaml_value(val)
+                current_section = None
             else:
                 result[key] = {}
                 current_section = key
-        elif current_section and line[0].isspace() and ":" in stripped:
-            key, _, val = stripped.partition(":")
-            result[current_section][key.strip()] = _yaml_value(val.strip())
+        elif current_section:
+            result[current_section][key] = _yaml_value(val)
     return result
 
 
 def _yaml_value(s: str):
     """Convert a YAML scalar string to Python type."""
-    if not s or s == '""' or s == "''":
+    if not s:
         return ""
     # Strip quotes
-    if (s.startswith('"') and s.endswith('"')) or (s.startswith("'") and s.endswith("'")):
+    first = s[0]
+    if first in "\"'" and len(s) > 1 and s[-1] == first:
         return s[1:-1]
-    if s.lower() == "true":
-        return True
-    if s.lower() == "false":
-        return False
-    if s.lower() in ("null", "~"):
-        return None
-    try:
+    # Constants are at most 5 chars; longer scalars skip the lower() allocation
+    if len(s) <= 5:
+        const = _YAML_CONSTANTS.get(s.lower(), s)
+        if const is not s:
+            return const
+    # Only numeric-looking scalars pay for int()/float()
+    # isdecimal, not isdigit: int() rejects digits like "²" that isdigit accepts
+    if s.isdecimal():
         return int(s)
-    except ValueError:
-        pass
-    try:
-        return float(s)
-    except ValueError:
-        pass
-    # Strip inline comments
-    if " #" in s:
-        s = s[:s.index(" #")].strip()
+    if s[0] in "+-.0123456789":
+        try:
+            return int(s)
+        except ValueError:
+            pass
+        try:
+            return float(s)
+        except ValueError:
+            pass
     return s
 
 
 def load_runtime_config(app_root: Path) -> dict:
-    """Load keystone.config.json (JSONC supported)."""
+    """Load keystone.config.json (JSONC supported). Parsed once per app root."""
+    return _load_runtime_config(str(app_root.resolve()))
+
+
+@functools.lru_cache(maxsize=None)
+def _load_runtime_config(app_root: str) -> dict:
     for name in ["keystone.config.json", "keystone.json"]:
-        path = app_root / name
+        path = Path(app_root) / name
         if path.exists():
-            text = path.read_text()
-            text = re.sub(r'^\s*//.*$', '', text, flags=re.MULTILINE)
-            return json.loads(text)
+            return _cached_parse(path, _parse_jsonc)
     return {}
 
 
+def _parse_jsonc(text: str) -> dict:
+    return json.loads(strip_comments(text))
+
+
 # ─── Engine discovery ─────────────────────────────────────────────────────────
 
 def find_engine(build_cfg: dict) -> Path:
     """Locate the Keystone Desktop engine. Currently: vendored adjacent to app (source checkout)."""
+    return _find_engine(str(build_cfg.get("engine", ENGINE_VERSION)))
+
+
+@functools.lru_cache(maxsize=None)
+def _find_engine(version: str) -> Path:
     # 1. Source checkout — this script is inside the engine
     if (ENGINE_ROOT / "Keystone.App").exists() or (ENGINE_ROOT / "Keystone.Core").exists():
         return ENGINE_ROOT
 
     # 2. Global cache
-    version = build_cfg.get("engine", ENGINE_VERSION)
     cache = Path.home() / ".keystone" / "engines" / version
     if (cache / "version.txt").exists():
         return cache
@@ -135,22 +302,258 @@ def find_engine(build_cfg: dict) -> Path:
     return cache
 
 
+def _sha256_file(path: Path) -> str:
+    import mmap
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                h.update(m)
+    return h.hexdigest()
+
+
+DOWNLOAD_CHUNK = 4 * 1024 * 1024
+
+
+class _TeeReader:
+    """Read-only file wrapper that copies every chunk read from src into sink."""
+
+    def __init__(self, src, sink):
+        self.src = src
+        self.sink = sink
+
+    def read(self, n=-1):
+        data = self.src.read(n)
+        self.sink.write(data)
+        return data
+
+
+def _native_untar(dest_dir: Path):
+    """Start a native extractor for a .tar.gz fed on stdin: pigz (multi-core gunzip) piped into
+    tar when pigz is installed, else tar -xzf (libarchive on macOS). Returns (stdin, procs),
+    or None when tar is not on PATH."""
+    if not shutil.which("tar"):
+        return None
+    pigz = shutil.which("pigz")
+    if pigz:
+        gunzip = subprocess.Popen([pigz, "-dc"], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        untar = subprocess.Popen(["tar", "-xf", "-", "-C", str(dest_dir)], stdin=gunzip.stdout)
+        gunzip.stdout.close()
+        return gunzip.stdin, [gunzip, untar]
+    untar = subprocess.Popen(["tar", "-xzf", "-", "-C", str(dest_dir)], stdin=subprocess.PIPE)
+    return untar.stdin, [untar]
+
+
+def _extract_members(t, dest_dir: Path):
+    """Extract a streaming tarfile member by member, skipping regular files already on
+    disk with the archive's size and mtime (tarfile stamps both on extract) — a re-extract
+    after an interrupted run only writes what is missing, truncated or from another
+    version. Only the tarfile fallback gets this; macOS and Linux extract with native tar."""
+    for member in t:
+        if member.isfile():
+            try:
+                st = os.stat(os.path.join(dest_dir, member.name))
+                if st.st_size == member.size and int(st.st_mtime) == int(member.mtime):
+                    continue
+            except OSError:
+                pass
+        t.extract(member, dest_dir)
+
+
+def _extract_tarball(fileobj, dest_dir: Path, sink=None):
+    """Extract a .tar.gz stream into dest_dir, using native tar when available and the
+    tarfile module otherwise. If sink is given, every byte read is also written to it."""
+    src = _TeeReader(fileobj, sink) if sink else fileobj
+    native = _native_untar(dest_dir)
+    if native is None:
+        import tarfile
+        with tarfile.open(fileobj=src, mode="r|gz", bufsize=DOWNLOAD_CHUNK) as t:
+            _extract_members(t, dest_dir)
+        # tarfile stops at the end-of-archive marker; drain the padding so sink gets it all
+        while src.read(DOWNLOAD_CHUNK):
+            pass
+        return
+    stdin, procs = native
+    try:
+        while chunk := src.read(DOWNLOAD_CHUNK):
+            stdin.write(chunk)
+    finally:
+        stdin.close()
+    for proc in procs:
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, proc.args)
+
+
+def _fetch_published_sha256(url: str):
+    """The hex digest from {url}.sha256, or None when the release doesn't publish one."""
+    import urllib.request
+    try:
+        with urllib.request.urlopen(url + ".sha256", timeout=15) as resp:
+            fields = resp.read(4096).decode("ascii", "replace").split()
+    except Exception:
+        return None
+    digest = fields[0].lower() if fields else ""
+    return digest if re.fullmatch(r"[0-9a-f]{64}", digest) else None
+
+
+def _download_to(request, part: Path, resume_from: int):
+    """Download request into part, continuing from resume_from bytes with a Range request."""
+    import urllib.error
+    import urllib.request
+    if resume_from:
+        request.add_header("Range", f"bytes={resume_from}-")
+        print(f"  Resuming {request.full_url} at byte {resume_from}")
+    else:
+        print(f"  Downloading {request.full_url}")
+    try:
+        with urllib.request.urlopen(request) as resp:
+            # 206 continues the partial file; a 200 means the server ignored Range
+            mode = "ab" if resume_from and resp.status == 206 else "wb"
+            with open(part, mode) as f:
+                shutil.copyfileobj(resp, f, DOWNLOAD_CHUNK)
+    except urllib.error.HTTPError as e:
+        if not (resume_from and e.code == 416):
+            raise
+        # 416: nothing past resume_from — the partial file is already complete
+
+
+PARALLEL_RANGES = 8
+
+
+def _download_ranges(url: str, part: Path) -> bool:
+    """Download url into part with PARALLEL_RANGES concurrent Range requests, each writing
+    its own region of a preallocated file. Returns False (nothing written) when the server
+    doesn't advertise byte ranges, the file is too small to be worth splitting, or any
+    request fails — the caller then falls back to a single-stream download."""
+    import http.client
+    import urllib.request
+    # URLError/HTTPError are OSErrors; HTTPException covers malformed responses
+    errors = (OSError, ValueError, http.client.HTTPException)
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, method="HEAD"), timeout=15) as resp:
+            size = int(resp.headers.get("Content-Length") or 0)
+            ranges_ok = resp.headers.get("Accept-Ranges", "").lower() == "bytes"
+    except errors:
+        return False
+    if not ranges_ok or size < PARALLEL_RANGES * DOWNLOAD_CHUNK:
+        return False
+
+    step = -(-size // PARALLEL_RANGES)
+    spans = [(lo, min(lo + step, size) - 1) for lo in range(0, size, step)]
+
+    def fetch(span):
+        lo, hi = span
+        request = urllib.request.Request(url, headers={"Range": f"bytes={lo}-{hi}"})
+        with urllib.request.urlopen(request, timeout=15) as resp:
+            if resp.status != 206:
+                raise ValueError(f"server ignored Range (HTTP {resp.status})")
+            offset = lo
+            while chunk := resp.read(DOWNLOAD_CHUNK):
+                os.pwrite(fd, chunk, offset)
+                offset += len(chunk)
+        if offset != hi + 1:
+            raise ValueError(f"short read for bytes {lo}-{hi}")
+
+    print(f"  Downloading {url} ({PARALLEL_RANGES} connections)")
+    fd = os.open(part, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.ftruncate(fd, size)
+        with ThreadPoolExecutor(max_workers=len(spans)) as pool:
+            list(pool.map(fetch, spans))
+    except BaseException as e:
+        # A file with holes must not be resumed as if it were a prefix
+        os.close(fd)
+        part.unlink(missing_ok=True)
+        if isinstance(e, errors):
+            print(f"  Parallel download failed ({e}), retrying as a single stream")
+            return False
+        raise
+    os.close(fd)
+    return True
+
+
 def _download_engine(version: str, dest: Path):
+    # Only reached when the engine isn't cached; kept out of module import for CLI startup
+    import http.client
+    import urllib.error
+    import urllib.request
+    from email.utils import formatdate
+
     tarball_name = f"Keystone-{version}-arm64.tar.gz"
     url = f"https://github.com/khayzz13/keystone_desktop/releases/download/{version}/{tarball_name}"
     dest.mkdir(parents=True, exist_ok=True)
-    tmp = dest.parent / tarball_name
-    print(f"  Downloading {url}")
+    tarball = dest.parent / tarball_name
+    sidecar = dest.parent / f"{tarball_name}.sha256"
+
+    # The tarball is kept next to the cache with a .sha256 sidecar, so re-runs can
+    # re-extract without downloading again
+    cached = (tarball.exists() and sidecar.exists()
+              and sidecar.read_text().strip() == _sha256_file(tarball))
+
+    # A release may publish {tarball}.sha256; when it does the download is verified
+    # before extraction, and a matching cached tarball needs no download at all
+    expected = _fetch_published_sha256(url)
+    part = tarball.with_name(tarball.name + ".part")
+    resume_from = part.stat().st_size if part.exists() else 0
+
+    request = urllib.request.Request(url)
+    # Revalidate by date only when there is no published checksum to compare against —
+    # otherwise a 304 would extract a cached tarball the checksum just rejected
+    if cached and expected is None and not resume_from:
+        request.add_header("If-Modified-Since", formatdate(sidecar.stat().st_mtime, usegmt=True))
+    # Set only once this run has written (and, with a checksum, verified) the .part
+    downloaded = False
     try:
-        urllib.request.urlretrieve(url, tmp)
+        if cached and expected and sidecar.read_text().strip() == expected:
+            print(f"  Cached tarball matches the published checksum")
+            print(f"  Extracting...")
+            with open(tarball, "rb") as f:
+                _extract_tarball(f, dest.parent)
+        elif expected is None and not resume_from:
+            # Extract while downloading: the response streams into the extractor and is
+            # teed into the tarball on disk in the same pass
+            print(f"  Downloading {url}")
+            with urllib.request.urlopen(request) as resp, open(part, "wb") as f:
+                print(f"  Extracting...")
+                _extract_tarball(resp, dest.parent, sink=f)
+            downloaded = True
+        else:
+            # Buffered: fresh downloads fan out over parallel ranges; an interrupted .part
+            # is resumed. Either way the file is verified, then extracted from disk
+            if resume_from or cached or not _download_ranges(url, part):
+                _download_to(request, part, resume_from)
+            if expected and _sha256_file(part) != expected:
+                part.unlink()
+                raise ValueError(f"checksum mismatch for {tarball_name} (expected {expected})")
+            downloaded = True
+            print(f"  Extracting...")
+            with open(part, "rb") as f:
+                _extract_tarball(f, dest.parent)
+        if downloaded:
+            os.replace(part, tarball)
+            sidecar.write_text((expected or _sha256_file(tarball)) + "\n")
+    except urllib.error.HTTPError as e:
+        if not (cached and e.code == 304):
+            part.unlink(missing_ok=True)
+            print(f"  ERROR: Download failed: {e}")
+            print(f"  Download manually and extract to {dest}")
+            sys.exit(1)
+        print(f"  Cached tarball is current (304 Not Modified)")
+        print(f"  Extracting...")
+        with open(tarball, "rb") as f:
+            _extract_tarball(f, dest.parent)
+    except (urllib.error.URLError, OSError, http.client.HTTPException) as e:
+        # Network failure: keep the partial download so the next run resumes it
+        print(f"  ERROR: Download failed: {e}")
+        if part.exists():
+            print(f"  Partial download kept ({part.stat().st_size} bytes) — re-run to resume")
+        print(f"  Download manually and extract to {dest}")
+        sys.exit(1)
     except Exception as e:
+        part.unlink(missing_ok=True)
         print(f"  ERROR: Download failed: {e}")
         print(f"  Download manually and extract to {dest}")
         sys.exit(1)
-    print(f"  Extracting...")
-    with tarfile.open(tmp) as t:
-        t.extractall(dest.parent)
-    tmp.unlink(missing_ok=True)
     extracted = dest.parent / "keystone-desktop"
     if extracted.exists() and extracted != dest:
         extracted.rename(dest)
@@ -159,7 +562,40 @@ def _download_engine(version: str, dest: Path):
 
 # ─── Build steps ──────────────────────────────────────────────────────────────
 
-def vendor_engine_bun(app_root: Path, engine: Path, bun_root: str = "bun"):
+BUILD_STAMP = ".keystone-build-stamp"
+INSTALL_STAMP = ".keystone-install-stamp"
+VENDOR_STAMP = ".keystone-vendor-stamp"
+
+
+def _hash_files(paths) -> str:
+    """BLAKE2b over (path, contents) of each file. Missing files hash as absent."""
+    h = hashlib.blake2b(digest_size=16)
+    for p in paths:
+        h.update(os.fsencode(p) + b"\0")
+        try:
+            h.update(Path(p).read_bytes())
+        except FileNotFoundError:
+            h.update(b"\0missing")
+    return h.hexdigest()
+
+
+def _hash_tree_stat(root: Path, skip_dirs=()) -> str:
+    """BLAKE2b over (path, size, mtime_ns) of every file under root — no file contents read."""
+    h = hashlib.blake2b(digest_size=16)
+    for entry in sorted(_walk(root, skip_dirs), key=lambda e: e.path):
+        st = entry.stat(follow_symlinks=False)
+        h.update(f"{entry.path}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+    return h.hexdigest()
+
+
+def _stamp_matches(stamp: Path, key: str) -> bool:
+    try:
+        return stamp.read_text() == key
+    except OSError:
+        return False
+
+
+def vendor_engine_bun(app_root: Path, engine: Path, bun_root: str = "bun", paranoid: bool = False):
     """Copy engine bun runtime + SDK into app's node_modules as real files."""
     engine_bun = engine / "bun"
     bun_dir = app_root / bun_root
@@ -169,34 +605,44 @@ def vendor_engine_bun(app_root: Path, engine: Path, bun_root: str = "bun"):
     nm = bun_dir / "node_modules"
     nm.mkdir(parents=True, exist_ok=True)
 
-    # keystone-desktop -> engine/bun/ (host.ts, types.ts, lib/, sdk/, etc.)
     dst_kd = nm / "keystone-desktop"
-    if dst_kd.exists():
-        shutil.rmtree(dst_kd)
-    shutil.copytree(engine_bun, dst_kd, ignore=shutil.ignore_patterns(
-        "node_modules", ".bun", "bun.lock", "tsconfig.json"))
-    print(f"  Vendored keystone-desktop -> {dst_kd.relative_to(app_root)}")
-
-    # @keystone/sdk -> engine/bun/sdk/
     dst_sdk = nm / "@keystone" / "sdk"
-    if dst_sdk.exists():
-        shutil.rmtree(dst_sdk)
-    dst_sdk.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copytree(engine_bun / "sdk", dst_sdk)
-    print(f"  Vendored @keystone/sdk -> {dst_sdk.relative_to(app_root)}")
-
-    # @keystone/types.ts -> engine/bun/types.ts (SDK imports ../types relative to sdk/)
-    engine_types = engine_bun / "types.ts"
-    if engine_types.exists():
-        shutil.copy2(engine_types, nm / "@keystone" / "types.ts")
-
+    tasks = [
+        # keystone-desktop -> engine/bun/ (host.ts, types.ts, lib/, sdk/, etc.)
+        (engine_bun, dst_kd, ("node_modules", ".bun", "bun.lock", "tsconfig.json")),
+        # @keystone/sdk -> engine/bun/sdk/
+        (engine_bun / "sdk", dst_sdk, ()),
+    ]
     # @keystone/lib -> engine/bun/lib/ (SDK imports ../lib/store relative to sdk/)
     engine_lib = engine_bun / "lib"
     if engine_lib.exists():
-        dst_lib = nm / "@keystone" / "lib"
-        if dst_lib.exists():
-            shutil.rmtree(dst_lib)
-        shutil.copytree(engine_lib, dst_lib)
+        tasks.append((engine_lib, nm / "@keystone" / "lib", ()))
+    # @keystone/types.ts -> engine/bun/types.ts (SDK imports ../types relative to sdk/)
+    engine_types = engine_bun / "types.ts"
+    dst_types = nm / "@keystone" / "types.ts"
+    has_types = engine_types.exists()
+
+    # Skip when no file in the engine bun tree changed since the last vendor and every
+    # vendored path is still in place
+    stamp = nm / VENDOR_STAMP
+    key = _hash_tree_stat(engine_bun, {"node_modules", ".bun"})
+    vendored = [dst for _, dst, _ in tasks] + ([dst_types] if has_types else [])
+    if not paranoid and _stamp_matches(stamp, key) and all(d.exists() for d in vendored):
+        print(f"  Engine bun runtime up-to-date (cached)")
+        return
+
+    # The destinations are disjoint, so the syncs run concurrently
+    dst_sdk.parent.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(sync_tree, src, dst, ignore, paranoid) for src, dst, ignore in tasks]
+        if has_types:
+            _copy_if_changed(engine_types, dst_types)
+        for future in futures:
+            future.result()
+    print(f"  Vendored keystone-desktop -> {dst_kd.relative_to(app_root)}")
+    print(f"  Vendored @keystone/sdk -> {dst_sdk.relative_to(app_root)}")
+
+    stamp.write_text(key)
 
 
 def _resolve_engine_rel(csproj: Path, engine: Path):
@@ -209,11 +655,126 @@ def _resolve_engine_rel(csproj: Path, engine: Path):
     print(f"    Resolved {{{{ENGINE_REL}}}} → {rel}")
 
 
+_PROJECT_REF_RE = re.compile(r'<ProjectReference\s+Include="([^"]+)"')
+
+
+def _project_dirs(csproj: Path, seen=None) -> set:
+    """Directories of csproj and every project it references, transitively."""
+    seen = set() if seen is None else seen
+    proj_dir = csproj.parent.resolve()
+    if proj_dir in seen or not csproj.exists():
+        return seen
+    seen.add(proj_dir)
+    for ref in _PROJECT_REF_RE.findall(csproj.read_text()):
+        _project_dirs(csproj.parent / ref.replace("\\", "/"), seen)
+    return seen
+
+
+@functools.lru_cache(maxsize=None)
+def _dir_csprojs(proj_dir: Path) -> tuple:
+    """The .csproj files directly in proj_dir, listed once per CLI run."""
+    try:
+        with os.scandir(proj_dir) as it:
+            return tuple(Path(e.path) for e in it if e.name.endswith(".csproj") and e.is_file())
+    except (FileNotFoundError, NotADirectoryError):
+        return ()
+
+
+def _restore_current(proj_dir: Path) -> bool:
+    """True when obj/project.assets.json is newer than every csproj in proj_dir."""
+    try:
+        assets = (proj_dir / "obj" / "project.assets.json").stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+    return all(p.stat().st_mtime_ns < assets for p in _dir_csprojs(proj_dir))
+
+
+def _csproj_stamp(csproj: Path):
+    """(stamp path, key, project dirs) for csproj — the key covers every file in it and
+    its referenced projects by (path, size, mtime)."""
+    proj_dirs = sorted(_project_dirs(csproj))
+    skip = {"bin", "obj", "node_modules", ".git", "dist"}
+    key = "\n".join(_hash_tree_stat(d, skip) for d in proj_dirs)
+    return csproj.parent / "obj" / f"{csproj.stem}{BUILD_STAMP}", key, proj_dirs
+
+
+_ASSEMBLY_NAME_RE = re.compile(r"<AssemblyName>\s*([^<]+?)\s*</AssemblyName>")
+
+
+def _csproj_built(csproj: Path) -> bool:
+    """True when csproj's Release assembly is on disk — the stamp lives in obj/, so a
+    deleted bin/ alone would otherwise pass for a cached build. A custom OutputPath
+    isn't followed; such projects just rebuild."""
+    m = _ASSEMBLY_NAME_RE.search(csproj.read_text(errors="replace"))
+    name = f"{m.group(1) if m else csproj.stem}.dll"
+    release = csproj.parent / "bin" / "Release"
+    # bin/Release/<tfm>/, plus /<rid>/ when a RuntimeIdentifier is set
+    return any(release.rglob(name))
+
+
+def _write_stamp(stamp: Path, key: str):
+    stamp.parent.mkdir(exist_ok=True)
+    stamp.write_text(key)
+
+
+def _build_csproj(csproj: Path):
+    """dotnet build csproj, skipped when no file in it or its referenced projects has
+    changed (path, size, mtime) since the last successful build and its output exists."""
+    stamp, key, proj_dirs = _csproj_stamp(csproj)
+    if _stamp_matches(stamp, key) and _csproj_built(csproj):
+        print(f"    up to date (cached)")
+        return
+    cmd = [_tool("dotnet"), "build", str(csproj), "-c", "Release"]
+    if all(_restore_current(d) for d in proj_dirs):
+        cmd.append("--no-restore")
+    run(cmd, prefix="[dotnet] ")
+    _write_stamp(stamp, key)
+
+
+def _build_group(csprojs: list):
+    """Build same-priority projects with one MSBuild graph build. The stale projects are
+    listed in a generated .slnx, so the SDK starts once and MSBuild schedules the
+    projects (and any shared references) in parallel itself."""
+    if len(csprojs) == 1:
+        _build_csproj(csprojs[0])
+        return
+    stale = []
+    for csproj in csprojs:
+        stamp, key, proj_dirs = _csproj_stamp(csproj)
+        if _stamp_matches(stamp, key) and _csproj_built(csproj):
+            print(f"    [{csproj.stem}] up to date (cached)")
+        else:
+            stale.append((csproj, stamp, key, proj_dirs))
+    if not stale:
+        return
+
+    # Named after the project set, so an unchanged group reuses the same file
+    paths = sorted(str(csproj.resolve()) for csproj, *_ in stale)
+    name = hashlib.blake2b("\n".join(paths).encode(), digest_size=8).hexdigest()
+    solution = CONFIG_CACHE_DIR / f"build-{name}.slnx"
+    text = "<Solution>\n" + "".join(
+        f'  <Project Path="{os.path.relpath(p, CONFIG_CACHE_DIR)}" />\n' for p in paths) + "</Solution>\n"
+    try:
+        current = solution.read_text() == text
+    except OSError:
+        current = False
+    if not current:
+        CONFIG_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        solution.write_text(text)
+
+    cmd = [_tool("dotnet"), "build", str(solution), "-c", "Release", "-graph", "-maxcpucount", "--nologo"]
+    if all(_restore_current(d) for *_, proj_dirs in stale for d in proj_dirs):
+        cmd.append("--no-restore")
+    run(cmd, prefix="[dotnet] ")
+    for _, stamp, key, _ in stale:
+        _write_stamp(stamp, key)
+
+
 def build_cs(app_root: Path, engine: Path, build_cfg: dict, no_plugins: bool = False):
     """Build C# projects in priority order from build_cs config.
 
     build_cs entries are "priority:path" where path is a .csproj or directory.
-    Same priority builds sequentially. Directories build all contained .csproj files.
+    Same priority builds concurrently; priorities build in ascending order. Directories build all contained .csproj files.
     Falls back to legacy single-assembly build if build_cs is absent.
     If no_plugins is True, only the lowest priority group (core) is built.
     """
@@ -240,71 +801,112 @@ def build_cs(app_root: Path, engine: Path, build_cfg: dict, no_plugins: bool = F
 
     for prio in priorities:
         print(f"\n=== Building C# [priority {prio}] ===")
+        # Same-priority projects are independent of each other's build order, so the
+        # group is collected first and built as one graph build
+        csprojs = []
         for label, path in groups[prio]:
             resolved = app_root / path
             if resolved.suffix == ".csproj" and resolved.exists():
                 _resolve_engine_rel(resolved, engine)
                 print(f"  [{label}] {path}")
-                run(["dotnet", "build", str(resolved), "-c", "Release"])
+                csprojs.append(resolved)
             elif resolved.is_dir():
-                csprojs = sorted(resolved.glob("**/*.csproj"))
-                if not csprojs:
+                # Pruned walk: bin/obj/node_modules never hold the projects themselves
+                found = sorted(Path(e.path) for e in _walk(resolved, {"bin", "obj", "node_modules", ".git"})
+                               if e.name.endswith(".csproj"))
+                if not found:
                     print(f"  [{label}] {path} — no .csproj found, skipping")
                     continue
-                for csproj in csprojs:
+                for csproj in found:
                     _resolve_engine_rel(csproj, engine)
                     print(f"  [{label}] {csproj.relative_to(app_root)}")
-                    run(["dotnet", "build", str(csproj), "-c", "Release"])
+                    csprojs.append(csproj)
             else:
                 print(f"  [{label}] {path} — not found, skipping")
+        if csprojs:
+            _build_group(csprojs)
 
 
-def setup_bun(app_root: Path, engine: Path, bun_root: str = "bun"):
+def setup_bun(app_root: Path, engine: Path, bun_root: str = "bun", paranoid: bool = False):
     """Install bun dependencies and vendor engine runtime."""
     bun_dir = app_root / bun_root
     if not (bun_dir / "package.json").exists():
         return
 
     print(f"\n=== Installing Bun Dependencies ===")
-    run(["bun", "install"], cwd=bun_dir)
-    vendor_engine_bun(app_root, engine, bun_root)
+    nm = bun_dir / "node_modules"
+    stamp = nm / INSTALL_STAMP
+    # bun.lockb is the binary lockfile older bun versions write instead of bun.lock
+    key = _hash_files([bun_dir / "package.json", bun_dir / "bun.lock", bun_dir / "bun.lockb"])
+    if nm.exists() and _stamp_matches(stamp, key):
+        print(f"  bun deps up-to-date (cached)")
+    else:
+        run([_tool("bun"), "install"], cwd=bun_dir, prefix="[bun] ")
+        nm.mkdir(exist_ok=True)
+        stamp.write_text(key)
+        # bun install may prune the vendored packages; force a re-vendor
+        (nm / VENDOR_STAMP).unlink(missing_ok=True)
+    vendor_engine_bun(app_root, engine, bun_root, paranoid=paranoid)
 
 
 def find_engine_binary(engine: Path) -> Path:
     """Find the Keystone.App binary from the engine."""
-    # Distributed layout
-    simple = engine / "bin" / "Keystone.App"
-    if simple.exists():
-        return simple
-    # Source checkout
-    for mode in ["Release", "Debug"]:
-        src = (engine / "Keystone.App" / "bin" / mode / "net10.0-macos" / "osx-arm64"
-               / "Keystone.app" / "Contents" / "MacOS" / "Keystone.App")
-        if src.exists():
-            return src
+    return _find_engine_binary(str(engine))
+
+
+@functools.lru_cache(maxsize=None)
+def _find_engine_binary(engine: str):
+    candidates = [
+        # Distributed layout
+        os.path.join(engine, "bin", "Keystone.App"),
+        # Source checkout
+        *(os.path.join(engine, "Keystone.App", "bin", mode, "net10.0-macos", "osx-arm64",
+                       "Keystone.app", "Contents", "MacOS", "Keystone.App")
+          for mode in ["Release", "Debug"]),
+    ]
+    for path in candidates:
+        try:
+            os.stat(path)
+        except OSError:
+            continue
+        return Path(path)
     return None
 
 
 def clean(app_root: Path, build_cfg: dict = {}):
     print("\n=== Cleaning ===")
-    for csproj in app_root.rglob("*.csproj"):
-        proj_dir = csproj.parent
+    # Collect first, then remove in parallel — each project's bin/obj is independent
+    targets = []
+    for entry in _walk(app_root, {"bin", "obj", "node_modules", ".git", "dist", "dylib"}):
+        if not entry.name.endswith(".csproj"):
+            continue
+        proj_dir = Path(entry.path).parent
         for name in ["bin", "obj"]:
             d = proj_dir / name
             if d.exists():
-                shutil.rmtree(d)
-                print(f"  Removed {proj_dir.name}/{name}/")
+                targets.append((d, f"{proj_dir.name}/{name}/"))
+    # The packaged output is usually the largest tree — remove it alongside bin/obj
+    pkg = build_cfg.get("package")
+    if not isinstance(pkg, dict):
+        pkg = {}
+    out_dir_name = pkg.get("out_directory", build_cfg.get("outDir", "dist"))
+    dist_dir = app_root / out_dir_name
+    if dist_dir.exists():
+        targets.append((dist_dir, f"{out_dir_name}/"))
+    # One native rm -rf for all of them; rmtree on a pool where there is no rm (Windows)
+    rm = shutil.which("rm") if os.name == "posix" else None
+    if targets and rm:
+        subprocess.run([rm, "-rf", "--", *(str(d) for d, _ in targets)], check=True)
+    elif targets:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda t: shutil.rmtree(t[0]), targets))
+    for _, label in targets:
+        print(f"  Removed {label}")
     dylib_dir = app_root / build_cfg.get("dylib_directory", "dylib")
     if dylib_dir.exists():
         for f in dylib_dir.glob("*.dll"):
             f.unlink()
             print(f"  Removed {f.name}")
-    pkg = build_cfg.get("package", {}) if isinstance(build_cfg.get("package"), dict) else {}
-    out_dir_name = pkg.get("out_directory", build_cfg.get("outDir", "dist"))
-    dist_dir = app_root / out_dir_name
-    if dist_dir.exists():
-        shutil.rmtree(dist_dir)
-        print(f"  Removed {out_dir_name}/")
 
 
 # ─── Commands ─────────────────────────────────────────────────────────────────
@@ -313,7 +915,7 @@ def resolve_bun_root(build_cfg: dict, runtime_cfg: dict) -> str:
     """bun_directory in build yaml > bun.root in runtime config > 'bun'."""
     if build_cfg.get("bun_directory"):
         return build_cfg["bun_directory"]
-    bun = runtime_cfg.get("bun", {})
+    bun = runtime_cfg.get("bun")
     return bun.get("root", "bun") if isinstance(bun, dict) else "bun"
 
 
@@ -321,24 +923,31 @@ def resolve_dylib_dir(build_cfg: dict, runtime_cfg: dict) -> str:
     """dylib_directory in build yaml > plugins.dir in runtime config > 'dylib'."""
     if build_cfg.get("dylib_directory"):
         return build_cfg["dylib_directory"]
-    plugins = runtime_cfg.get("plugins", {})
+    plugins = runtime_cfg.get("plugins")
     return plugins.get("dir", "dylib") if isinstance(plugins, dict) else "dylib"
 
 
-def cmd_build(app_root: Path, build_cfg: dict, runtime_cfg: dict, no_plugins: bool = False):
+def cmd_build(app_root: Path, build_cfg: dict, runtime_cfg: dict, no_plugins: bool = False,
+              paranoid: bool = False):
     """Build step: compile C# projects + install bun deps + vendor engine."""
     engine = find_engine(build_cfg)
     bun_root = resolve_bun_root(build_cfg, runtime_cfg)
 
-    build_cs(app_root, engine, build_cfg, no_plugins=no_plugins)
-    setup_bun(app_root, engine, bun_root)
+    # C# (app/, engine projects) and bun (bun/) touch disjoint trees — run them side by side.
+    # Tool output is relayed line by line behind [dotnet] / [bun] tags so it stays readable.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        cs = pool.submit(build_cs, app_root, engine, build_cfg, no_plugins=no_plugins)
+        bun = pool.submit(setup_bun, app_root, engine, bun_root, paranoid=paranoid)
+        cs.result()
+        bun.result()
 
     return engine
 
 
-def cmd_run(app_root: Path, build_cfg: dict, runtime_cfg: dict, no_plugins: bool = False):
+def cmd_run(app_root: Path, build_cfg: dict, runtime_cfg: dict, no_plugins: bool = False,
+            paranoid: bool = False):
     """Build and run in dev mode."""
-    engine = cmd_build(app_root, build_cfg, runtime_cfg, no_plugins=no_plugins)
+    engine = cmd_build(app_root, build_cfg, runtime_cfg, no_plugins=no_plugins, paranoid=paranoid)
     binary = find_engine_binary(engine)
     if binary is None:
         print(f"  ERROR: Engine binary not found. Build the engine first.")
@@ -350,7 +959,7 @@ def cmd_run(app_root: Path, build_cfg: dict, runtime_cfg: dict, no_plugins: bool
     env["KEYSTONE_ROOT"] = str(app_root)
 
     # Surface dev_extensions_directory to the runtime so it can load 3rd-party plugin dev builds
-    plugins_build = build_cfg.get("plugins", {})
+    plugins_build = build_cfg.get("plugins")
     if isinstance(plugins_build, dict) and plugins_build.get("dev_extensions_directory"):
         ext_dir = Path(plugins_build["dev_extensions_directory"]).expanduser().resolve()
         env["KEYSTONE_DEV_EXTENSIONS"] = str(ext_dir)
@@ -359,9 +968,10 @@ def cmd_run(app_root: Path, build_cfg: dict, runtime_cfg: dict, no_plugins: bool
 
 
 def cmd_package(app_root: Path, build_cfg: dict, runtime_cfg: dict,
-                mode=None, dmg=False, allow_external=False, no_plugins: bool = False):
+                mode=None, dmg=False, allow_external=False, no_plugins: bool = False,
+                paranoid: bool = False):
     """Build and package into distributable .app bundle."""
-    engine = cmd_build(app_root, build_cfg, runtime_cfg, no_plugins=no_plugins)
+    engine = cmd_build(app_root, build_cfg, runtime_cfg, no_plugins=no_plugins, paranoid=paranoid)
     packager = engine / "tools" / "package.py"
     if not packager.exists():
         print(f"  ERROR: Packager not found at {packager}")
@@ -396,6 +1006,8 @@ def main():
                         help="Override plugins.allow_external_signatures")
     parser.add_argument("--no-plugins", action="store_true",
                         help="Skip plugin builds (only core + bun)")
+    parser.add_argument("--paranoid", action="store_true",
+                        help="Byte-compare every vendored engine file instead of trusting size/mtime")
 
     args = parser.parse_args()
     app_root = Path(args.app_root).resolve()
@@ -410,14 +1022,17 @@ def main():
     if args.command == "clean":
         cmd_clean(app_root, build_cfg)
     elif args.command == "build":
-        cmd_build(app_root, build_cfg, runtime_cfg, no_plugins=args.no_plugins)
+        cmd_build(app_root, build_cfg, runtime_cfg, no_plugins=args.no_plugins,
+                  paranoid=args.paranoid)
     elif args.command == "run":
-        cmd_run(app_root, build_cfg, runtime_cfg, no_plugins=args.no_plugins)
+        cmd_run(app_root, build_cfg, runtime_cfg, no_plugins=args.no_plugins,
+                paranoid=args.paranoid)
     elif args.command == "package":
         cmd_package(app_root, build_cfg, runtime_cfg,
                     mode=args.mode, dmg=args.dmg,
                     allow_external=args.allow_external,
-                    no_plugins=args.no_plugins)
+                    no_plugins=args.no_plugins,
+                    paranoid=args.paranoid)
 
 
 if __name__ == "__main__":
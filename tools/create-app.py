@@ -15,6 +15,7 @@ import argparse
 import os
 import re
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 SCRIPT_DIR = Path(__file__).parent
@@ -25,23 +26,84 @@ ENGINE_ROOT = SCRIPT_DIR.parent
 _version_file = ENGINE_ROOT / "version.txt"
 KEYSTONE_VERSION = _version_file.read_text().strip() if _version_file.exists() else "0.1.0"
 
+_SLUG_SEP_RE = re.compile(r"[-_]")
+
+# Never contain placeholders — skipped without opening
+BINARY_SUFFIXES = {".png", ".icns", ".ico", ".jpg", ".jpeg", ".gif", ".webp",
+                   ".woff", ".woff2", ".ttf", ".otf", ".zip", ".gz", ".dylib", ".dll"}
+
 
 def slug_to_name(slug: str) -> str:
     """my-app -> My App"""
-    return " ".join(word.capitalize() for word in re.split(r"[-_]", slug))
+    return " ".join(word.capitalize() for word in _SLUG_SEP_RE.split(slug))
 
 
 def slug_to_namespace(slug: str) -> str:
     """my-app -> MyApp"""
-    return "".join(word.capitalize() for word in re.split(r"[-_]", slug))
+    return "".join(word.capitalize() for word in _SLUG_SEP_RE.split(slug))
 
 
 def slug_to_id(slug: str) -> str:
     """my-app -> com.keystone.myapp"""
-    clean = re.sub(r"[-_]", "", slug.lower())
+    clean = _SLUG_SEP_RE.sub("", slug.lower())
     return f"com.keystone.{clean}"
 
 
+def _is_probably_text(filepath: Path) -> bool:
+    """Known binary extension, or a NUL byte in the first 512 bytes, means binary."""
+    if filepath.suffix.lower() in BINARY_SUFFIXES:
+        return False
+    with open(filepath, "rb") as f:
+        return b"\0" not in f.read(512)
+
+
+def make_replacer(replacements: dict):
+    """Return a bytes -> bytes function that substitutes every placeholder in one pass.
+
+    Works on raw UTF-8 bytes so template files skip decode/encode entirely. Uses a
+    pyahocorasick automaton when installed (linear in text length regardless of the
+    number of placeholders); otherwise a compiled bytes regex alternation, which is just
+    as fast for the handful of placeholders the template has today. Worth installing
+    pyahocorasick only if the placeholder set grows into the dozens.
+    """
+    table = {k.encode(): v.encode() for k, v in replacements.items()}
+    try:
+        import ahocorasick
+    except ImportError:
+        pattern = re.compile(b"|".join(re.escape(k) for k in table))
+        return lambda data: pattern.sub(lambda m: table[m.group(0)], data)
+
+    # The automaton matches str; latin-1 maps each byte to one code point, losslessly
+    automaton = ahocorasick.Automaton()
+    for key, value in table.items():
+        automaton.add_word(key.decode("latin-1"), (len(key), value))
+    automaton.make_automaton()
+
+    def replace(data: bytes) -> bytes:
+        parts, pos = [], 0
+        for end, (length, value) in automaton.iter_long(data.decode("latin-1")):
+            parts.append(data[pos:end - length + 1])
+            parts.append(value)
+            pos = end + 1
+        if not parts:
+            return data
+        parts.append(data[pos:])
+        return b"".join(parts)
+    return replace
+
+
+def _substitute_file(filepath: Path, replace):
+    """Replace every placeholder in filepath in a single pass. Binary files are left alone."""
+    if not _is_probably_text(filepath):
+        return
+    with open(filepath, "rb") as f:
+        data = f.read()
+    new = replace(data)
+    if new != data:
+        with open(filepath, "wb") as f:
+            f.write(new)
+
+
 def scaffold(target_dir: Path, replacements: dict, native: bool):
     """Copy template/ to target_dir with placeholder substitution."""
     if target_dir.exists():
@@ -59,20 +121,11 @@ def scaffold(target_dir: Path, replacements: dict, native: bool):
         if app_dir.exists():
             shutil.rmtree(app_dir)
 
-    # Walk all files and do replacements
-    for filepath in sorted(target_dir.rglob("*")):
-        if filepath.is_dir():
-            continue
-
-        try:
-            content = filepath.read_text()
-            original = content
-            for placeholder, value in replacements.items():
-                content = content.replace(placeholder, value)
-            if content != original:
-                filepath.write_text(content)
-        except UnicodeDecodeError:
-            pass  # binary file, skip
+    # Walk all files and do replacements: one pass per file, files in parallel
+    replace = make_replacer(replacements)
+    files = [p for p in target_dir.rglob("*") if p.is_file()]
+    with ThreadPoolExecutor() as pool:
+        list(pool.map(lambda p: _substitute_file(p, replace), files))
 
     # Native mode: rename App.Core.csproj to {Namespace}.Core.csproj
     if native:
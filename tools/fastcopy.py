@@ -0,0 +1,80 @@
+"""
+Keystone Desktop — file copy helpers
+
+The one copy of the clonefile(2)/copyfile(3) bindings, shared by build.py,
+tools/cli.py, tools/package.py and the rust_ffi / example build scripts (each
+puts this directory on sys.path). Every helper replaces an existing dst rather
+than writing through it, so a dst that is a hardlink never modifies its source.
+"""
+
+import fnmatch
+import os
+import shutil
+import sys
+
+_libsystem = None
+COPYFILE_ALL = 0x000F  # ACL | STAT | XATTR | DATA
+
+
+def _load_libsystem():
+    """Bind libSystem's clonefile(2) and copyfile(3) on first use. Returns None off macOS."""
+    global _libsystem
+    if _libsystem is None and sys.platform == "darwin":
+        import ctypes
+        import ctypes.util
+        _libsystem = ctypes.cdll.LoadLibrary(ctypes.util.find_library("System"))
+        _libsystem.clonefile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int]
+        _libsystem.clonefile.restype = ctypes.c_int
+        _libsystem.copyfile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_void_p, ctypes.c_uint32]
+        _libsystem.copyfile.restype = ctypes.c_int
+    return _libsystem
+
+
+def fast_copy2(src, dst, follow_symlinks=True):
+    """Drop-in for shutil.copy2 (usable as copytree's copy_function). Tries an APFS
+    copy-on-write clone, then kernel-side copyfile(3), then shutil.copy2."""
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    # clonefile requires that dst does not exist; the fallbacks must not write through it
+    if os.path.lexists(dst):
+        os.unlink(dst)
+    libsystem = _load_libsystem()
+    if libsystem and follow_symlinks:
+        src_b, dst_b = os.fsencode(src), os.fsencode(dst)
+        if libsystem.clonefile(src_b, dst_b, 0) == 0:
+            return dst
+        if libsystem.copyfile(src_b, dst_b, None, COPYFILE_ALL) == 0:
+            return dst
+    return shutil.copy2(src, dst, follow_symlinks=follow_symlinks)
+
+
+def link_or_copy(src, dst, link=True):
+    """Hardlink src to dst (no bytes moved on the same filesystem); clone/copy on
+    EXDEV/EPERM or when link is False."""
+    if link:
+        if os.path.lexists(dst):
+            os.unlink(dst)
+        try:
+            os.link(src, dst)
+            return dst
+        except OSError:
+            pass
+    return fast_copy2(src, dst)
+
+
+def clone_tree(src, dst, ignore=()):
+    """Clone a directory tree with a single APFS clonefile(2) call, then prune entries
+    matching the ignore patterns. Falls back to shutil.copytree. dst must not exist."""
+    libsystem = _load_libsystem()
+    if libsystem and libsystem.clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0:
+        for dirpath, dirnames, filenames in os.walk(dst):
+            for name in [n for n in dirnames if any(fnmatch.fnmatch(n, p) for p in ignore)]:
+                shutil.rmtree(os.path.join(dirpath, name))
+                dirnames.remove(name)
+            for name in filenames:
+                if any(fnmatch.fnmatch(name, p) for p in ignore):
+                    os.unlink(os.path.join(dirpath, name))
+        return
+    if os.path.exists(dst):
+        shutil.rmtree(dst)
+    shutil.copytree(src, dst, ignore=shutil.ignore_patterns(*ignore), copy_function=fast_copy2)
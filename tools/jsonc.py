@@ -0,0 +1,26 @@
+"""
+Keystone Desktop — JSONC comment stripping
+
+Shared by tools/cli.py and tools/package.py, so keystone.config.json is read the
+same way by the CLI and the packager.
+"""
+
+import re
+
+# A JSON string (kept as-is), a // line comment or a /* block */ comment. Strings are
+# matched first so "http://..." or "src/**/*.ts" inside values survive.
+_COMMENT = r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?\*/'
+_COMMENT_RE = re.compile(_COMMENT, re.DOTALL)
+_COMMENT_RE_BYTES = re.compile(_COMMENT.encode(), re.DOTALL)
+
+
+def strip_comments(data):
+    """Remove // line and /* block */ comments from JSONC str or bytes, leaving string
+    contents untouched. Comment-free input is returned as-is."""
+    if isinstance(data, bytes):
+        if b"//" not in data and b"/*" not in data:
+            return data
+        return _COMMENT_RE_BYTES.sub(lambda m: m.group(1) or b"", data)
+    if "//" not in data and "/*" not in data:
+        return data
+    return _COMMENT_RE.sub(lambda m: m.group(1) or "", data)
@@ -16,31 +16,163 @@ import subprocess
 import os
 import sys
 import json
+import plistlib
+import re
 import shutil
 import argparse
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 SCRIPT_DIR = Path(__file__).parent
 ENGINE_ROOT = SCRIPT_DIR.parent  # keystone/
 
+sys.path.insert(0, str(SCRIPT_DIR))
+from fastcopy import fast_copy2, link_or_copy
+from jsonc import strip_comments
+
+_PLIST_TOKEN_RE = re.compile(
+    r"\{\{(BUNDLE_NAME|BUNDLE_ID|BUNDLE_VERSION|BUNDLE_EXECUTABLE|BUNDLE_CATEGORY|MIN_VERSION)\}\}")
+
+
+def render_plist_template(text: str, tokens: dict) -> str:
+    """Substitute {{TOKEN}} placeholders in one pass, so a value containing a {{TOKEN}} is
+    never substituted again. Values are stringified — YAML reads an unquoted 14.0 as a float."""
+    values = {k: str(v) for k, v in tokens.items()}
+    return _PLIST_TOKEN_RE.sub(lambda m: values[m.group(1)], text)
+
+
+# Every fd this script opens is non-inheritable (PEP 446), so children can skip the
+# close-everything loop in the forked child
+def run(cmd, cwd=None, check=True, close_fds=False):
+    print(f"  $ {' '.join(map(str, cmd))}")
+    return subprocess.run(cmd, cwd=cwd, check=check, close_fds=close_fds)
+
+
+def run_parallel(cmds, cwd=None, check=True):
+    """Run independent commands concurrently. Output is buffered per command and printed
+    in order once all finish; with check, raises CalledProcessError for the first failure."""
+    for cmd in cmds:
+        print(f"  $ {' '.join(str(c) for c in cmd)}")
+    with ThreadPoolExecutor(max_workers=max(len(cmds), 1)) as pool:
+        results = list(pool.map(
+            lambda cmd: subprocess.run(cmd, cwd=cwd, capture_output=True, text=True,
+                                       close_fds=False), cmds))
+    for result in results:
+        print(result.stdout, end="")
+        print(result.stderr, end="", file=sys.stderr)
+    for cmd, result in zip(cmds, results):
+        if check and result.returncode != 0:
+            raise subprocess.CalledProcessError(result.returncode, cmd)
+    return results
+
+
+def fast_copytree(src, dst, ignore=(), link=True):
+    """copytree over os.scandir that places each file with link_or_copy. Names in ignore
+    are skipped at any depth. Existing directories are merged into."""
+    os.makedirs(dst, exist_ok=True)
+    with os.scandir(src) as it:
+        for entry in it:
+            if entry.name in ignore:
+                continue
+            target = os.path.join(dst, entry.name)
+            if entry.is_dir():
+                fast_copytree(entry.path, target, ignore, link)
+            else:
+                link_or_copy(entry.path, target, link)
+
+
+# ─── Incremental cache ───────────────────────────────────────────────────────
+
+def _load_manifest(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_atomic(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _save_manifest(path: Path, manifest: dict):
+    _write_atomic(path, json.dumps(manifest, indent=2).encode())
+
+
+def _prune_cache(cache_dir: Path, pattern: str, keep: int = 8):
+    """Delete all but the `keep` most recently written files matching pattern."""
+    entries = sorted(cache_dir.glob(pattern), key=lambda p: p.stat().st_mtime_ns, reverse=True)
+    for stale in entries[keep:]:
+        stale.unlink(missing_ok=True)
+
+
+def _stat_tree(h, root, skip=(), skip_prefixes=(), skip_dirs=()):
+    """Feed (path, size, mtime_ns) of every file under root into hash h. Names in skip
+    (files or directories) and files starting with any of skip_prefixes are ignored, as
+    are the directories at the paths in skip_dirs."""
+    skip_dirs = {os.path.realpath(d) for d in skip_dirs}
 
-def run(cmd, cwd=None, check=True):
-    print(f"  $ {' '.join(str(c) for c in cmd) if isinstance(cmd, list) else cmd}")
-    return subprocess.run(cmd, cwd=cwd, check=check, shell=isinstance(cmd, str))
+    def keep(dirpath, name):
+        if name in skip:
+            return False
+        return not skip_dirs or os.path.realpath(os.path.join(dirpath, name)) not in skip_dirs
 
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if keep(dirpath, d))
+        for name in sorted(filenames):
+            if name in skip or name.startswith(skip_prefixes):
+                continue
+            path = os.path.join(dirpath, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            h.update(f"{path}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+
+
+def has_entries(path) -> bool:
+    """True if path is a directory with at least one entry — a single opendir/readdir."""
+    try:
+        with os.scandir(path) as it:
+            return next(it, None) is not None
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+
+
+def write_entry_wrapper(bun_root, stem: str, lines: list) -> Path:
+    """Write a generated compile entrypoint into bun_root under a unique name, so imports
+    resolve exactly as from a fixed file but concurrent package runs never collide."""
+    fd, path = tempfile.mkstemp(prefix=f"{stem}.", suffix=".ts", dir=bun_root)
+    with os.fdopen(fd, "w") as f:
+        f.write("\n".join(lines))
+    return Path(path)
 
-def discover_services(svc_dir: Path) -> list:
+
+def discover_services(svc_dir) -> list:
     """Discover service modules in a directory. Returns [(name, abs_path), ...]."""
     result = []
-    if not svc_dir.exists():
+    # scandir's DirEntry carries the file type from readdir — no stat per entry
+    try:
+        with os.scandir(svc_dir) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except (FileNotFoundError, NotADirectoryError):
         return result
-    for entry in sorted(svc_dir.iterdir()):
-        if entry.is_file() and entry.suffix in ('.ts', '.tsx'):
-            result.append((entry.stem, str(entry)))
+    for entry in entries:
+        if entry.is_file() and entry.name.endswith(('.ts', '.tsx')):
+            result.append((os.path.splitext(entry.name)[0], entry.path))
         elif entry.is_dir():
-            idx = entry / "index.ts"
-            if idx.exists():
-                result.append((entry.name, str(idx)))
+            idx = os.path.join(entry.path, "index.ts")
+            if os.path.isfile(idx):
+                result.append((entry.name, idx))
     return result
 
 
@@ -102,16 +234,28 @@ def load_build_yaml(app_root: Path) -> dict:
     return result
 
 
+def _loads(data: bytes):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def write_json(path: Path, obj, indent=True):
+    """Atomically write obj as JSON bytes (orjson when available, stdlib json otherwise) —
+    one buffer to a temp file, then os.replace. indent=False writes compact JSON."""
+    if orjson:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    elif indent:
+        data = json.dumps(obj, indent=2).encode()
+    else:
+        data = json.dumps(obj, separators=(",", ":")).encode()
+    _write_atomic(path, data)
+
+
 def load_config(app_root: Path) -> dict:
     """Load keystone.config.json (or keystone.json fallback) with JSONC support."""
     for name in ["keystone.config.json", "keystone.json"]:
         path = app_root / name
         if path.exists():
-            text = path.read_text()
-            # Strip single-line comments (// ...) for JSONC support
-            import re
-            text = re.sub(r'^\s*//.*$', '', text, flags=re.MULTILINE)
-            config = json.loads(text)
+            config = _loads(strip_comments(path.read_bytes()))
             print(f"  Config: {path.name}")
             return config
     print(f"  ERROR: No keystone.config.json or keystone.json found in {app_root}")
@@ -120,6 +264,22 @@ def load_config(app_root: Path) -> dict:
 
 # ─── Engine discovery ────────────────────────────────────────────────────────
 
+# engine root -> publish Contents/ found while probing, so find_engine_contents
+# doesn't repeat the stat walk
+_ENGINE_CONTENTS = {}
+
+
+def _publish_contents(engine: Path):
+    """First dotnet publish Contents/ (Release, then Debug) that has a MacOS/ dir."""
+    for mode in ["Release", "Debug"]:
+        src = os.path.join(engine, "Keystone.App", "bin", mode, "net10.0-macos", "osx-arm64",
+                           "Keystone.app", "Contents")
+        # One stat confirms both Contents/ and Contents/MacOS/
+        if os.path.isdir(os.path.join(src, "MacOS")):
+            return mode, Path(src)
+    return None, None
+
+
 def find_engine(app_root: Path, explicit: str = None) -> Path:
     """Locate Keystone Desktop (framework runtime). Returns path to engine root."""
     if explicit:
@@ -139,16 +299,19 @@ def find_engine(app_root: Path, explicit: str = None) -> Path:
 
     for c in candidates:
         # Check for dotnet publish output
-        for config_mode in ["Release", "Debug"]:
-            src = c / "Keystone.App" / "bin" / config_mode / "net10.0-macos" / "osx-arm64" / "Keystone.app" / "Contents"
-            if src.exists() and (src / "MacOS").exists():
-                print(f"  Engine: {c} ({config_mode})")
-                return c
+        config_mode, contents = _publish_contents(c)
+        if contents:
+            _ENGINE_CONTENTS[c] = contents
+            print(f"  Engine: {c} ({config_mode})")
+            return c
 
     # 3. Global cache — check version.txt
-    version_file = ENGINE_ROOT / "version.txt"
-    if version_file.exists():
-        version = version_file.read_text().strip()
+    try:
+        with open(ENGINE_ROOT / "version.txt") as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        version = None
+    if version:
         cache = Path.home() / ".keystone" / "engines" / version
         if cache.exists():
             print(f"  Engine: {cache} (cached)")
@@ -162,6 +325,8 @@ def find_engine(app_root: Path, explicit: str = None) -> Path:
 
 def find_engine_contents(engine: Path) -> Path:
     """Find the dotnet publish Contents/ directory within the engine."""
+    if engine in _ENGINE_CONTENTS:
+        return _ENGINE_CONTENTS[engine]
     for mode in ["Release", "Debug"]:
         src = engine / "Keystone.App" / "bin" / mode / "net10.0-macos" / "osx-arm64" / "Keystone.app" / "Contents"
         if src.exists():
@@ -247,34 +412,50 @@ def package(app_root: Path, engine: Path, mode_override=None,
     # Clean previous build
     if bundle_path.exists():
         shutil.rmtree(bundle_path)
-    bundle_macos.mkdir(parents=True, exist_ok=True)
-    bundle_resources.mkdir(parents=True, exist_ok=True)
+
+    # Directories already created this run — later steps skip the parent-chain walk
+    made_dirs = set()
+
+    def _ensure(path):
+        if path not in made_dirs:
+            os.makedirs(path, exist_ok=True)
+            made_dirs.add(path)
+
+    _ensure(bundle_macos)
+    _ensure(bundle_resources)
 
     # ── 1. Info.plist ────────────────────────────────────────────────────────
 
     template_path = engine / "Keystone.App" / "Info.plist.template"
     if template_path.exists():
-        plist = template_path.read_text()
-        plist = plist.replace("{{BUNDLE_NAME}}", app_name)
-        plist = plist.replace("{{BUNDLE_ID}}", app_id)
-        plist = plist.replace("{{BUNDLE_VERSION}}", app_version)
-        plist = plist.replace("{{BUNDLE_EXECUTABLE}}", "Keystone.App")
-        plist = plist.replace("{{BUNDLE_CATEGORY}}", category)
-        # Patch minimum system version if different from template default
-        if min_version != "15.0":
-            plist = plist.replace(
-                "<string>15.0</string><!-- LSMinimumSystemVersion -->",
-                f"<string>{min_version}</string>")
+        tokens = {
+            "BUNDLE_NAME": app_name,
+            "BUNDLE_ID": app_id,
+            "BUNDLE_VERSION": app_version,
+            "BUNDLE_EXECUTABLE": "Keystone.App",
+            "BUNDLE_CATEGORY": category,
+            "MIN_VERSION": min_version,
+        }
+        plist = render_plist_template(template_path.read_text(), tokens)
         (bundle_contents / "Info.plist").write_text(plist)
         print(f"  Info.plist: {app_name} ({app_id})")
     else:
         static = engine / "Keystone.App" / "Info.plist"
         if static.exists():
-            shutil.copy2(static, bundle_contents / "Info.plist")
+            fast_copy2(static, bundle_contents / "Info.plist")
 
     # ── 2. Framework runtime (MacOS/ + MonoBundle/) ──────────────────────────
 
+    # Hardlinking the publish output is only safe while nothing re-signs those files with a
+    # real identity; production signing gets independent copies
+    identity = signing_identity or "-"
+    link_files = identity == "-"
+
     src_contents = find_engine_contents(engine)
+    # Mach-Os added on top of the (already signed) engine publish output — step 11 signs
+    # just these plus the outer bundle instead of re-hashing the whole runtime with --deep
+    engine_was_signed = bool(src_contents) and (src_contents / "_CodeSignature").is_dir()
+    newly_built_binaries = []
     if src_contents:
         # Skip engine bun/ inside Resources — step 6 builds bun/ from scratch with
         # pre-bundled assets and compiled exes. The raw .ts engine files are dead weight.
@@ -287,11 +468,11 @@ def package(app_root: Path, engine: Path, mode_override=None,
                 if dst.exists():
                     shutil.rmtree(dst)
                 if item.name == "Resources":
-                    shutil.copytree(item, dst, ignore=shutil.ignore_patterns("bun"))
+                    fast_copytree(item, dst, ignore={"bun"}, link=link_files)
                 else:
-                    shutil.copytree(item, dst)
+                    fast_copytree(item, dst, link=link_files)
             else:
-                shutil.copy2(item, dst)
+                fast_copy2(item, dst)
         print(f"  Framework: copied")
     else:
         print(f"  WARNING: Framework not built — run 'python3 build.py' in the engine directory first")
@@ -301,31 +482,34 @@ def package(app_root: Path, engine: Path, mode_override=None,
     icon_dir = app_root / config.get("iconDir", "icons")
     icon_file = icon_dir / "AppIcon.icns"
     if icon_file.exists():
-        shutil.copy2(icon_file, bundle_resources / "AppIcon.icns")
+        # Replaced, not written into: the framework copy may have hardlinked an engine file here
+        fast_copy2(icon_file, bundle_resources / "AppIcon.icns")
         print(f"  Icon: AppIcon.icns")
 
     # ── 4. Plugins ───────────────────────────────────────────────────────────
 
     dylib_src = app_root / plugins_dir_name
+    dylib_src_exists = os.path.isdir(dylib_src)
     has_bundled_plugins = False
     has_plugins = False
 
     if plugins_enabled:
-        if plugin_mode == "bundled" and dylib_src.exists():
-            shutil.copytree(dylib_src, bundle_resources / "dylib")
+        if plugin_mode == "bundled" and dylib_src_exists:
+            fast_copytree(dylib_src, bundle_resources / "dylib", link=link_files)
+            newly_built_binaries += sorted((bundle_resources / "dylib").rglob("*.dylib"))
             has_bundled_plugins = True
             has_plugins = True
             print(f"  Plugins: bundled ({plugins_dir_name}/)")
         elif plugin_mode == "side-by-side":
-            has_plugins = dylib_src.exists() or has_external_dirs
-            if dylib_src.exists():
+            has_plugins = dylib_src_exists or has_external_dirs
+            if dylib_src_exists:
                 print(f"  Plugins: side-by-side ({plugins_dir_name}/ stays external)")
             if user_dir_configured:
                 print(f"  Plugins: userDir configured")
             if extension_dir_configured:
                 print(f"  Plugins: extensionDir configured")
         else:
-            has_plugins = dylib_src.exists() or has_external_dirs
+            has_plugins = dylib_src_exists or has_external_dirs
 
     # ── 5. App assembly ──────────────────────────────────────────────────────
 
@@ -335,8 +519,8 @@ def package(app_root: Path, engine: Path, mode_override=None,
         if not bundle_dest.exists():
             src = app_root / app_assembly
             if src.exists():
-                bundle_dest.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(src, bundle_dest)
+                _ensure(bundle_dest.parent)
+                fast_copy2(src, bundle_dest)
                 print(f"  App assembly: {app_assembly}")
             else:
                 print(f"  WARNING: appAssembly not found: {src}")
@@ -353,79 +537,153 @@ def package(app_root: Path, engine: Path, mode_override=None,
     bun_dev_mode = bool(pkg_cfg.get("dev_mode", False))
     if isinstance(bun_cfg, dict) and bun_cfg.get("enabled", True):
         bun_root = app_root / bun_cfg.get("root", "bun")
+        # Plain-string form for the per-service probes and wrapper paths below
+        bun_root_str = os.fspath(bun_root)
+        engine_bun_str = os.path.join(engine, "bun")
+        sdk_dir_str = os.path.join(bun_root_str, "node_modules", "keystone-desktop")
         bundle_bun = bundle_resources / bun_cfg.get("root", "bun")
-        bundle_bun.mkdir(parents=True, exist_ok=True)
+        # Resolved once; every bun spawn below skips the PATH search
+        bun_bin = shutil.which("bun") or "bun"
+        _ensure(bundle_bun)
 
-        # Read bun-side config: extract web entries + resolve full config for distribution.
+        # One bun process resolves keystone.config.ts (web entries + full config for
+        # distribution) and, in production, pre-bundles every web component (6a) —
+        # a single bun cold start instead of one for the config and one for the build.
         bun_config_ts = bun_root / "keystone.config.ts"
         web_dir_name = "web"
-        web_components = {}
         resolved_bun_config = None
-        if bun_config_ts.exists():
+        build_web = not bun_dev_mode
+
+        # resolveConfig is deterministic for a given keystone.config.ts and SDK version,
+        # so its output is cached on disk and handed back to the driver on a hit — in
+        # dev mode (no web build) that skips the bun process altogether.
+        cfg_cache = None
+        cached_cfg = None
+        try:
+            cfg_key = hashlib.blake2b(bun_config_ts.read_bytes(), digest_size=16)
+            try:
+                cfg_key.update((bun_root / "node_modules" / "@keystone" / "sdk" / "package.json").read_bytes())
+            except OSError:
+                pass
+            cfg_cache = out_dir / ".keystone-cache" / f"resolved_{cfg_key.hexdigest()}.json"
+            cached_cfg = _loads(cfg_cache.read_bytes())
+        except (OSError, ValueError):
+            pass
+        if cached_cfg is not None:
+            web_dir_name = cached_cfg.get("webDir", "web")
+            resolved_bun_config = cached_cfg.get("resolved")
+            print(f"  Bun config: keystone.config.ts unchanged (cached)")
+
+        if bun_root.exists() and (build_web or (bun_config_ts.exists() and cached_cfg is None)):
+            driver = f"""
+            const fs = require("fs");
+            const path = require("path");
+            const bunRoot = {json.dumps(str(bun_root))};
+            const configTs = {json.dumps(str(bun_config_ts))};
+            const cached = {json.dumps(cached_cfg)};
+            let webDir = "web", components = {{}}, resolved = null;
+            if (cached) {{
+                ({{ webDir, components }} = cached);
+                components = {{ ...components }};
+            }} else if (fs.existsSync(configTs)) {{
+                try {{
+                    const {{ resolveConfig }} = require(path.join(bunRoot, "node_modules/@keystone/sdk/config.ts"));
+                    const mod = require(configTs);
+                    const cfg = mod.default ?? mod;
+                    resolved = resolveConfig(cfg);
+                    webDir = cfg.web?.dir ?? "web";
+                    components = {{ ...(cfg.web?.components ?? {{}}) }};
+                }} catch (e) {{
+                    console.log("  WARNING: Could not parse bun config: " + e.message);
+                }}
+            }}
+            if (!cached) console.log("__KEYSTONE_CFG__" + JSON.stringify({{ webDir, components, resolved }}));
+
+            if ({json.dumps(build_web)}) {{
+                // 6a. Web components: auto-discover .ts/.tsx in the web dir — merged with
+                // explicit entries (don't overwrite) — and bundle them all concurrently
+                const webSrc = path.join(bunRoot, webDir);
+                if (fs.existsSync(webSrc)) {{
+                    for (const f of fs.readdirSync(webSrc, {{ withFileTypes: true }}).sort((a, b) => a.name < b.name ? -1 : 1)) {{
+                        const m = f.isFile() && f.name.match(/^(.*)\\.tsx?$/);
+                        if (m && !(m[1] in components)) components[m[1]] = `./${{webDir}}/${{f.name}}`;
+                    }}
+                }}
+                const outdir = path.join({json.dumps(str(bundle_bun))}, webDir);
+                fs.mkdirSync(outdir, {{ recursive: true }});
+                const entries = [];
+                for (const [name, entry] of Object.entries(components)) {{
+                    const abs = path.join(bunRoot, entry.replace(/^[./]+/, ""));
+                    if (fs.existsSync(abs)) entries.push([name, abs]);
+                    else console.log(`    WARNING: ${{entry}} not found, skipping ${{name}}`);
+                }}
+                if (entries.length) {{
+                    console.log(`  Pre-bundling ${{entries.length}} web component(s)...`);
+                    // Only this step is fatal — it reports failure with its own sentinel so
+                    // the packager can tell it apart from a crash while resolving the config
+                    let failed = false;
+                    try {{
+                        const results = await Promise.all(entries.map(([name, entry]) => Bun.build({{
+                            entrypoints: [entry],
+                            outdir,
+                            target: "browser",
+                            format: "esm",
+                            naming: `${{name}}.[ext]`,
+                        }})));
+                        results.forEach((result, i) => {{
+                            if (!result.success) {{
+                                failed = true;
+                                for (const log of result.logs) console.error(entries[i][0] + ": " + log.message);
+                            }} else {{
+                                console.log("    " + entries[i][0] + ": " + result.outputs.length + " file(s)");
+                            }}
+                        }});
+                    }} catch (e) {{
+                        failed = true;
+                        console.error(e?.message ?? String(e));
+                    }}
+                    if (failed) {{
+                        console.log("__KEYSTONE_WEB_FAILED__");
+                        process.exit(1);
+                    }}
+                    console.log("__KEYSTONE_WEB_BUILT__");
+                }}
+            }}
+            """
             try:
-                extract_script = f"""
-                const {{ resolveConfig }} = require("{bun_root}/node_modules/@keystone/sdk/config.ts");
-                const mod = require("{bun_config_ts}");
-                const cfg = mod.default ?? mod;
-                const resolved = resolveConfig(cfg);
-                console.log(JSON.stringify({{
-                    webDir: cfg.web?.dir ?? "web",
-                    components: cfg.web?.components ?? {{}},
-                    resolved: resolved,
-                }}));
-                """
-                result = subprocess.run(["bun", "-e", extract_script],
-                    capture_output=True, text=True, cwd=bun_root)
-                if result.returncode == 0 and result.stdout.strip():
-                    parsed = json.loads(result.stdout.strip())
-                    web_dir_name = parsed.get("webDir", "web")
-                    web_components = parsed.get("components", {})
-                    resolved_bun_config = parsed.get("resolved")
-            except Exception as e:
-                print(f"  WARNING: Could not parse bun config: {e}")
-
-        # Auto-discover .ts/.tsx in web dir — merge with explicit entries (don't overwrite)
-        web_src_dir = bun_root / web_dir_name
-        if web_src_dir.exists():
-            for f in sorted(web_src_dir.iterdir()):
-                if f.suffix in (".ts", ".tsx") and f.is_file():
-                    name = f.stem
-                    if name not in web_components:
-                        web_components[name] = f"./{web_dir_name}/{f.name}"
+                result = subprocess.run([bun_bin, "-e", driver],
+                    stdout=subprocess.PIPE, text=True, cwd=bun_root, close_fds=False)
+            except OSError as e:
+                print(f"  WARNING: Could not run bun: {e}")
+                result = None
+            if result is not None:
+                web_failed = False
+                for line in result.stdout.splitlines():
+                    if line.startswith("__KEYSTONE_CFG__"):
+                        parsed = json.loads(line[len("__KEYSTONE_CFG__"):])
+                        web_dir_name = parsed.get("webDir", "web")
+                        resolved_bun_config = parsed.get("resolved")
+                        if cfg_cache and resolved_bun_config is not None:
+                            _write_atomic(cfg_cache, line[len("__KEYSTONE_CFG__"):].encode())
+                            _prune_cache(cfg_cache.parent, "resolved_*.json")
+                    elif line == "__KEYSTONE_WEB_BUILT__":
+                        pre_built_web = True
+                    elif line == "__KEYSTONE_WEB_FAILED__":
+                        web_failed = True
+                    else:
+                        print(line)
+                if web_failed:
+                    print(f"  ERROR: Pre-bundling web components failed")
+                    raise subprocess.CalledProcessError(result.returncode, ["bun", "-e", "<driver>"])
+                if result.returncode != 0:
+                    # Died before the web step (e.g. keystone.config.ts exited the process):
+                    # the app still runs, bundling web components from source at startup
+                    print(f"  WARNING: Could not parse bun config (bun exited with {result.returncode})")
 
         services_dir_name = "services"
         if resolved_bun_config:
             services_dir_name = resolved_bun_config.get("services", {}).get("dir", "services")
 
-        # 6a. Web components (production only — dev mode reads source dir directly)
-        if not bun_dev_mode:
-            bundle_web_dir = bundle_bun / web_dir_name
-            bundle_web_dir.mkdir(parents=True, exist_ok=True)
-
-            if web_components and bun_root.exists():
-                print(f"  Pre-bundling {len(web_components)} web component(s)...")
-                for name, entry in web_components.items():
-                    entry_abs = bun_root / entry.lstrip("./")
-                    if not entry_abs.exists():
-                        print(f"    WARNING: {entry} not found, skipping {name}")
-                        continue
-                    bundle_script = f"""
-                    const result = await Bun.build({{
-                        entrypoints: ["{entry_abs}"],
-                        outdir: "{bundle_web_dir}",
-                        target: "browser",
-                        format: "esm",
-                        naming: "{name}.[ext]",
-                    }});
-                    if (!result.success) {{
-                        for (const log of result.logs) console.error(log.message);
-                        process.exit(1);
-                    }}
-                    console.log("{name}: " + result.outputs.length + " file(s)");
-                    """
-                    run(["bun", "-e", bundle_script], cwd=bun_root)
-                    pre_built_web = True
-
         # 6b. Workers config
         workers_cfg = config.get("workers", []) or []
 
@@ -433,15 +691,45 @@ def package(app_root: Path, engine: Path, mode_override=None,
         if resolved_bun_config and not bun_dev_mode:
             resolved_bun_config["web"]["preBuilt"] = True
             resolved_json = bundle_bun / "keystone.resolved.json"
-            resolved_json.write_text(json.dumps(resolved_bun_config, indent=2))
+            # Machine-read only (by the compiled host at startup) — no pretty-printing
+            write_json(resolved_json, resolved_bun_config, indent=False)
             print(f"  Bun config: keystone.resolved.json (pre-resolved)")
 
         # 6e. Compile host.ts → single-file executable
-        host_ts = bun_root / "node_modules" / "keystone-desktop" / "host.ts"
-        if not host_ts.exists():
-            host_ts = engine / "bun" / "host.ts"
-
-        if host_ts.exists():
+        # Compiles are queued as (step, entrypoint, outfile, key) and skipped when the key
+        # matches the manifest from the last package run. The key covers the bun source
+        # tree, the vendored engine runtime, the lockfile and the bun binary itself.
+        compiles = []
+        wrappers = []
+        cache_dir = out_dir / ".keystone-cache"
+        manifest_path = cache_dir / "manifest.json"
+        bun_key = hashlib.blake2b(digest_size=16)
+        # With bun.root "." the app root holds out_dir too — its bundle and this cache
+        # change on every run and would keep the key from ever matching
+        _stat_tree(bun_key, bun_root, {"node_modules", ".git"}, ("_compiled_",),
+                   skip_dirs=(out_dir, cache_dir))
+        for vendored in ("keystone-desktop", "@keystone"):
+            _stat_tree(bun_key, bun_root / "node_modules" / vendored)
+        _stat_tree(bun_key, engine / "bun", {"node_modules"})
+        for lock in ("package.json", "bun.lock"):
+            try:
+                bun_key.update((bun_root / lock).read_bytes())
+            except OSError:
+                pass
+        if os.path.isabs(bun_bin):
+            bun_key.update(f"{bun_bin}\0{os.stat(bun_bin).st_mtime_ns}".encode())
+
+        def step_key(*parts):
+            h = bun_key.copy()
+            for part in parts:
+                h.update(str(part).encode() + b"\0")
+            return h.hexdigest()
+
+        host_ts = os.path.join(sdk_dir_str, "host.ts")
+        if not os.path.isfile(host_ts):
+            host_ts = os.path.join(engine_bun_str, "host.ts")
+
+        if os.path.isfile(host_ts):
             compiled_exe_name = safe_name
             compiled_exe_path = bundle_macos / compiled_exe_name
 
@@ -455,10 +743,9 @@ def package(app_root: Path, engine: Path, mode_override=None,
                 print(f"  Bun root: {bun_root} (live source, hot-reload enabled)")
             else:
                 # Production: bake services into exe via __KEYSTONE_COMPILED_SERVICES__
-                main_services = discover_services(bun_root / services_dir_name)
+                main_services = discover_services(os.path.join(bun_root_str, services_dir_name))
 
                 if main_services:
-                    wrapper = bun_root / "_compiled_host_entry.ts"
                     lines = []
                     for i, (name, path) in enumerate(main_services):
                         lines.append(f'import * as _svc{i} from "{path}";')
@@ -467,30 +754,27 @@ def package(app_root: Path, engine: Path, mode_override=None,
                         lines.append(f'  "{name}": _svc{i},')
                     lines.append('};')
                     lines.append(f'await import("{host_ts}");')
-                    wrapper.write_text('\n'.join(lines))
+                    wrapper = write_entry_wrapper(bun_root, "_compiled_host_entry", lines)
 
                     svc_names = ", ".join(n for n, _ in main_services)
                     print(f"  Compiling Bun -> {compiled_exe_name} (services: {svc_names})...")
-                    try:
-                        run(["bun", "build", "--compile", str(wrapper),
-                             "--outfile", str(compiled_exe_path)])
-                    finally:
-                        wrapper.unlink(missing_ok=True)
+                    compiles.append(("host", wrapper, compiled_exe_path,
+                                     step_key("host", *lines)))
+                    wrappers.append(wrapper)
                 else:
                     print(f"  Compiling Bun -> {compiled_exe_name}...")
-                    run(["bun", "build", "--compile", str(host_ts),
-                         "--outfile", str(compiled_exe_path)])
+                    compiles.append(("host", host_ts, compiled_exe_path, step_key("host", host_ts)))
         else:
             print(f"  WARNING: host.ts not found — Bun runtime not compiled")
 
         # 6f. Compile worker-host.ts → standalone worker executable (services baked in)
         compiled_worker_name = None
         if workers_cfg:
-            worker_host_ts = bun_root / "node_modules" / "keystone-desktop" / "worker-host.ts"
-            if not worker_host_ts.exists():
-                worker_host_ts = engine / "bun" / "worker-host.ts"
+            worker_host_ts = os.path.join(sdk_dir_str, "worker-host.ts")
+            if not os.path.isfile(worker_host_ts):
+                worker_host_ts = os.path.join(engine_bun_str, "worker-host.ts")
 
-            if worker_host_ts.exists():
+            if os.path.isfile(worker_host_ts):
                 compiled_worker_name = safe_name + "-worker"
                 compiled_worker_path = bundle_macos / compiled_worker_name
 
@@ -500,26 +784,23 @@ def package(app_root: Path, engine: Path, mode_override=None,
                     w_name = w.get("name", "")
                     svc_dir = w.get("servicesDir", "")
                     if w_name and svc_dir:
-                        svcs = discover_services(bun_root / svc_dir)
+                        svcs = discover_services(os.path.join(bun_root_str, svc_dir))
                         if svcs:
                             workers_services[w_name] = svcs
 
                 if workers_services:
                     # Generate wrapper that statically imports all worker services
-                    wrapper = bun_root / "_compiled_worker_entry.ts"
                     lines = []
-                    all_vars = []
+                    by_worker = {}
                     for w_name, svcs in workers_services.items():
+                        safe_w = w_name.replace("-", "_").replace(".", "_")
+                        w_vars = by_worker[w_name] = []
                         for i, (svc_name, path) in enumerate(svcs):
-                            safe_w = w_name.replace("-", "_").replace(".", "_")
                             var = f"_w_{safe_w}_{i}"
                             lines.append(f'import * as {var} from "{path}";')
-                            all_vars.append((w_name, svc_name, var))
+                            w_vars.append((svc_name, var))
 
                     lines.append('(globalThis as any).__KEYSTONE_COMPILED_SERVICES__ = {')
-                    by_worker = {}
-                    for w_name, svc_name, var in all_vars:
-                        by_worker.setdefault(w_name, []).append((svc_name, var))
                     for w_name, svcs in by_worker.items():
                         lines.append(f'  "{w_name}": {{')
                         for svc_name, var in svcs:
@@ -527,30 +808,54 @@ def package(app_root: Path, engine: Path, mode_override=None,
                         lines.append('  },')
                     lines.append('};')
                     lines.append(f'await import("{worker_host_ts}");')
-                    wrapper.write_text('\n'.join(lines))
+                    wrapper = write_entry_wrapper(bun_root, "_compiled_worker_entry", lines)
 
                     total = sum(len(s) for s in workers_services.values())
                     names = ", ".join(f"{w}({len(s)})" for w, s in workers_services.items())
                     print(f"  Compiling Worker -> {compiled_worker_name} ({total} services: {names})...")
-                    try:
-                        run(["bun", "build", "--compile", str(wrapper),
-                             "--outfile", str(compiled_worker_path)])
-                    finally:
-                        wrapper.unlink(missing_ok=True)
+                    compiles.append(("worker", wrapper, compiled_worker_path,
+                                     step_key("worker", *lines)))
+                    wrappers.append(wrapper)
                 else:
                     print(f"  Compiling Worker -> {compiled_worker_name}...")
-                    run(["bun", "build", "--compile", str(worker_host_ts),
-                         "--outfile", str(compiled_worker_path)])
+                    compiles.append(("worker", worker_host_ts, compiled_worker_path,
+                                     step_key("worker", worker_host_ts)))
             else:
                 print(f"  WARNING: worker-host.ts not found — workers not compiled")
 
+        # Host and worker compiles are independent — run them side by side. Executables
+        # are built into the cache dir and linked into the bundle from there.
+        manifest = _load_manifest(manifest_path)
+        pending = []
+        for step, entry, out_path, key in compiles:
+            cached_exe = cache_dir / out_path.name
+            if manifest.get(step) == key and cached_exe.exists():
+                print(f"  {out_path.name}: up to date (cached)")
+            else:
+                pending.append((step, entry, cached_exe, key))
+        try:
+            if pending:
+                _ensure(cache_dir)
+                run_parallel([[bun_bin, "build", "--compile", str(entry), "--outfile", str(cached_exe)]
+                              for _, entry, cached_exe, _ in pending])
+        finally:
+            for wrapper in wrappers:
+                wrapper.unlink(missing_ok=True)
+        for step, _, cached_exe, key in pending:
+            manifest[step] = key
+        if pending:
+            _save_manifest(manifest_path, manifest)
+        for _, _, out_path, _ in compiles:
+            link_or_copy(cache_dir / out_path.name, out_path, link_files)
+            newly_built_binaries.append(out_path)
+
     # ── 7. Scripts ───────────────────────────────────────────────────────────
 
     scripts_cfg = config.get("scripts", {})
     scripts_dir_name = scripts_cfg.get("dir", "scripts") if isinstance(scripts_cfg, dict) else "scripts"
     scripts_dir = app_root / scripts_dir_name
-    if scripts_dir.exists() and any(scripts_dir.iterdir()):
-        shutil.copytree(scripts_dir, bundle_resources / "scripts")
+    if has_entries(scripts_dir):
+        fast_copytree(scripts_dir, bundle_resources / "scripts", link=link_files)
         print(f"  Scripts: {scripts_dir_name}/")
 
     # ── 8. Extra resources ───────────────────────────────────────────────────
@@ -560,16 +865,16 @@ def package(app_root: Path, engine: Path, mode_override=None,
         if src.exists():
             dst = bundle_resources / Path(extra).name
             if src.is_dir():
-                shutil.copytree(src, dst, dirs_exist_ok=True)
+                fast_copytree(src, dst, link=link_files)
             else:
-                dst.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(src, dst)
+                _ensure(dst.parent)
+                fast_copy2(src, dst)
             print(f"  Extra: {extra}")
 
     # ── 9. Icons directory ───────────────────────────────────────────────────
 
     if icon_dir.exists():
-        shutil.copytree(icon_dir, bundle_resources / "icons", dirs_exist_ok=True)
+        fast_copytree(icon_dir, bundle_resources / "icons", link=link_files)
 
     # ── 10. Runtime config ───────────────────────────────────────────────────
     # Build the config that goes INTO the bundle. Strip build section,
@@ -621,7 +926,7 @@ def package(app_root: Path, engine: Path, mode_override=None,
         runtime_config["bun"] = rt_bun
 
     config_name = "keystone.config.json"
-    (bundle_resources / config_name).write_text(json.dumps(runtime_config, indent=2))
+    write_json(bundle_resources / config_name, runtime_config)
     print(f"  Config: {config_name}")
 
     # ── 11. Entitlements & signing ───────────────────────────────────────────
@@ -633,19 +938,17 @@ def package(app_root: Path, engine: Path, mode_override=None,
     tier = "hardened-runtime"
 
     if entitlements_src.exists():
-        entitlements_text = entitlements_src.read_text()
+        entitlements = plistlib.loads(entitlements_src.read_bytes())
 
         # External signatures: allow loading DLLs signed by other teams.
         if allow_external:
-            patch = "    <key>com.apple.security.cs.disable-library-validation</key>\n    <true/>\n"
-            entitlements_text = entitlements_text.replace("</dict>", patch + "</dict>")
+            entitlements["com.apple.security.cs.disable-library-validation"] = True
             tier += " + external-signatures"
 
-        entitlements_path.write_text(entitlements_text)
+        _write_atomic(entitlements_path, plistlib.dumps(entitlements))
     else:
         entitlements_path = None
 
-    identity = signing_identity or "-"
     is_adhoc = identity == "-"
 
     if require_signing_identity and is_adhoc:
@@ -666,28 +969,51 @@ def package(app_root: Path, engine: Path, mode_override=None,
     if is_adhoc:
         print("  NOTE: Using ad-hoc signature ('-'). Suitable for local/dev, not trusted distribution.")
 
-    sign_cmd = ["codesign", "--force", "--deep", "--sign", identity]
+    sign_cmd = ["codesign", "--force", "--sign", identity]
     if not is_adhoc:
         # Required for hardened runtime behavior expected in production distributions.
         sign_cmd += ["--options", "runtime", "--timestamp"]
     if entitlements_path:
         sign_cmd += ["--entitlements", str(entitlements_path)]
-    sign_cmd.append(str(bundle_path))
     print(f"  Signing ({tier}, {'ad-hoc' if is_adhoc else identity})...")
-    run(sign_cmd)
-
-    # Verify signature integrity immediately after signing.
+    targeted_sign = engine_was_signed and is_adhoc
+    if targeted_sign:
+        # The engine runtime already carries valid ad-hoc signatures: sign only the binaries
+        # this run introduced, then seal the outer bundle. A real identity still needs
+        # --deep so every inner Mach-O is re-signed under it.
+        if newly_built_binaries:
+            run_parallel([sign_cmd + [str(b)] for b in newly_built_binaries])
+        run(sign_cmd + [str(bundle_path)])
+    else:
+        run(sign_cmd[:2] + ["--deep"] + sign_cmd[2:] + [str(bundle_path)])
+
+    # Verify signature integrity immediately after signing. verify and spctl are
+    # read-only and xattr only touches extended attributes, so all three run at once.
+    # Full --deep verification re-hashes every Mach-O, so it defaults on only for real
+    # identities; ad-hoc builds just read the signature back (codesign -dv). Targeted
+    # signing already validated each inner binary, so only the outer seal is verified.
+    verify_signature = bool(bval("verify_signature", "verifySignature", not is_adhoc))
+    if not verify_signature:
+        verify_cmd = ["codesign", "-dv", str(bundle_path)]
+    elif targeted_sign:
+        verify_cmd = ["codesign", "--verify", "--strict", "--verbose=2", str(bundle_path)]
+    else:
+        verify_cmd = ["codesign", "--verify", "--strict", "--deep", "--verbose=2", str(bundle_path)]
     print("  Verifying signature...")
-    run(["codesign", "--verify", "--strict", "--deep", "--verbose=2", str(bundle_path)])
-    spctl_result = run(["spctl", "-a", "-t", "exec", "-vv", str(bundle_path)], check=False)
+    verify_result, spctl_result, _ = run_parallel([
+        verify_cmd,
+        ["spctl", "-a", "-t", "exec", "-vv", str(bundle_path)],
+        ["xattr", "-dr", "com.apple.quarantine", str(bundle_path)],
+    ], check=False)
+    if verify_result.returncode != 0:
+        print("  ERROR: codesign --verify failed for signed bundle.")
+        sys.exit(verify_result.returncode)
     if not is_adhoc and spctl_result.returncode != 0:
         print("  ERROR: Gatekeeper assessment failed for signed bundle.")
         sys.exit(spctl_result.returncode or 1)
     if is_adhoc and spctl_result.returncode != 0:
         print("  NOTE: Gatekeeper rejected ad-hoc signature (expected for local/dev builds).")
 
-    run(["xattr", "-dr", "com.apple.quarantine", str(bundle_path)], check=False)
-
     # ── 12. DMG ──────────────────────────────────────────────────────────────
 
     dmg_path = None
@@ -696,9 +1022,23 @@ def package(app_root: Path, engine: Path, mode_override=None,
         if dmg_path.exists():
             dmg_path.unlink()
         print(f"  Creating DMG...")
-        run(["hdiutil", "create", "-volname", app_name,
-             "-srcfolder", str(bundle_path), "-ov", "-format", "UDZO",
-             str(dmg_path)])
+        hdiutil_cmd = ["hdiutil", "create", "-volname", app_name,
+                       "-srcfolder", str(bundle_path), "-ov", "-format", "UDZO",
+                       str(dmg_path)]
+        if notarize:
+            # Check the notary credentials while the image builds, so a bad profile
+            # fails before the submit step instead of after a full hdiutil run.
+            dmg_result, auth_result = run_parallel([
+                hdiutil_cmd,
+                ["xcrun", "notarytool", "history", "--keychain-profile", notary_profile],
+            ], check=False)
+            if dmg_result.returncode != 0:
+                raise subprocess.CalledProcessError(dmg_result.returncode, hdiutil_cmd)
+            if auth_result.returncode != 0:
+                print(f"  ERROR: notarytool could not authenticate with profile '{notary_profile}'.")
+                sys.exit(auth_result.returncode)
+        else:
+            run(hdiutil_cmd)
         print(f"  DMG: {dmg_path}")
 
     # ── 13. Optional notarization ────────────────────────────────────────────
@@ -10,34 +10,36 @@ Usage:
   python3 build.py --debug  # Debug mode (combine with --run or --package)
 """
 
-import subprocess
+import re
+import runpy
 import sys
 from pathlib import Path
 
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
 APP_ROOT = Path(__file__).parent
 
+# Top-level `key: value` lines (indented keys don't match): a double-quoted, single-quoted
+# or bare value, then an optional trailing comment. As in YAML, only a "#" after
+# whitespace starts a comment, so a bare ../a#b is kept whole
+_YAML_RE = re.compile(
+    rb"(?m)^([A-Za-z_][\w-]*)[ \t]*:[ \t]*"
+    rb"(?:\"([^\"\n]*)\"|'([^'\n]*)'|((?:[^#\n][^\n]*?)?))[ \t]*(?:(?<=[ \t])#.*)?\r?$")
+
 
 def load_build_yaml() -> dict:
-    path = APP_ROOT / "keystone.build.yaml"
-    if not path.exists():
-        return {}
     try:
-        import yaml
-        return yaml.safe_load(path.read_text()) or {}
-    except ImportError:
-        pass
-    # Minimal key: value parser (no nesting needed here)
-    result = {}
-    for line in path.read_text().splitlines():
-        stripped = line.strip()
-        if not stripped or stripped.startswith("#"):
-            continue
-        if ":" in stripped and not line[0].isspace():
-            key, _, val = stripped.partition(":")
-            val = val.strip().strip('"').strip("'")
-            if val:
-                result[key.strip()] = val
-    return result
+        data = (APP_ROOT / "keystone.build.yaml").read_bytes()
+    except FileNotFoundError:
+        return {}
+    if yaml is not None:
+        return yaml.safe_load(data) or {}
+    # Minimal key: value scan (no nesting needed here)
+    values = ((k, dq or sq or bare) for k, dq, sq, bare in _YAML_RE.findall(data))
+    return {k.decode(): v.decode() for k, v in values if v}
 
 
 def find_engine(cfg: dict) -> Path:
@@ -82,8 +84,10 @@ def main():
         command = "build"
         flags = args
 
-    cmd = [sys.executable, str(cli), str(app_root), command] + flags
-    sys.exit(subprocess.run(cmd).returncode)
+    # Run the engine CLI in this interpreter rather than a second Python process; its
+    # sys.exit() codes propagate unchanged
+    sys.argv = [str(cli), str(app_root), command] + flags
+    runpy.run_path(str(cli), run_name="__main__")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,26 @@
+"""Tests for tools/jsonc.py, the JSONC reader shared by the CLI and the packager."""
+
+import importlib.util
+import json
+from pathlib import Path
+
+TOOLS = Path(__file__).resolve().parent.parent
+
+spec = importlib.util.spec_from_file_location("jsonc", TOOLS / "jsonc.py")
+jsonc = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(jsonc)
+
+
+def test_str_and_bytes_strip_the_same_comments():
+    text = (
+        '{\n'
+        '  // line comment\n'
+        '  "url": "https://example.com/*not*/", /* block\n comment */\n'
+        '  "glob": "src/**/*.ts",\n'
+        '  "quote": "a \\" // still a string"\n'
+        '}\n'
+    )
+    expected = {"url": "https://example.com/*not*/", "glob": "src/**/*.ts",
+                "quote": 'a " // still a string'}
+    assert json.loads(jsonc.strip_comments(text)) == expected
+    assert json.loads(jsonc.strip_comments(text.encode())) == expected
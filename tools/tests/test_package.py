@@ -0,0 +1,21 @@
+"""Tests for tools/package.py helpers."""
+
+import importlib.util
+from pathlib import Path
+
+TOOLS = Path(__file__).resolve().parent.parent
+
+
+def _load_package():
+    spec = importlib.util.spec_from_file_location("keystone_package", TOOLS / "package.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_plist_tokens_accept_unquoted_numeric_versions():
+    package = _load_package()
+    plist = package.render_plist_template(
+        "<string>{{BUNDLE_VERSION}}</string><string>{{MIN_VERSION}}</string>",
+        {"BUNDLE_VERSION": 2, "MIN_VERSION": 14.0})
+    assert plist == "<string>2</string><string>14.0</string>"
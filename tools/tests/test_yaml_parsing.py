@@ -0,0 +1,66 @@
+"""Tests for the regex YAML fallbacks used when PyYAML isn't installed."""
+
+import importlib.util
+from pathlib import Path
+
+TOOLS = Path(__file__).resolve().parent.parent
+
+
+def _load(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ─── tools/template/build.py ────────────────────────────────────────────────
+
+def _template_yaml(tmp_path: Path, text: str) -> dict:
+    build = _load("template_build", TOOLS / "template" / "build.py")
+    build.yaml = None
+    build.APP_ROOT = tmp_path
+    (tmp_path / "keystone.build.yaml").write_text(text)
+    return build.load_build_yaml()
+
+
+def test_template_quoted_values_keep_apostrophes_and_hashes(tmp_path):
+    cfg = _template_yaml(tmp_path, (
+        'framework_directory: "../bob\'s engine"\n'
+        'app_directory: "./a#b"  # trailing comment\n'
+        "name: 'single'\n"
+        "bare: value # comment\n"
+        "hash: ../a#b\n"
+        "empty: # nothing yet\n"
+    ))
+    assert cfg == {
+        "framework_directory": "../bob's engine",
+        "app_directory": "./a#b",
+        "name": "single",
+        "bare": "value",
+        "hash": "../a#b",
+    }
+
+
+# ─── tools/cli.py ───────────────────────────────────────────────────────────
+
+def test_cli_comment_only_value_is_empty_not_a_section():
+    cli = _load("keystone_cli", TOOLS / "cli.py")
+    cfg = cli._parse_simple_yaml(
+        "icon: # set later\n"
+        "name:  #x\n"
+        "build:\n"
+        "  debug: true  # comment\n"
+        "  out: \"dist # not a comment\"\n"
+    )
+    assert cfg == {
+        "icon": "",
+        "name": "",
+        "build": {"debug": True, "out": "dist # not a comment"},
+    }
+
+
+def test_cli_unicode_digit_scalars_stay_strings():
+    cli = _load("keystone_cli", TOOLS / "cli.py")
+    assert cli._yaml_value("²") == "²"
+    assert cli._yaml_value("①") == "①"
+    assert cli._yaml_value("42") == 42